@@ -1,15 +1,22 @@
 #python -m streamlit run "path of app.py" 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import date, datetime, timedelta
-from streamlit_calendar import calendar
+import uuid
+from datetime import date, timedelta
 
 # Import backend functions
+# (page-specific modules such as plotly, streamlit_calendar and pandas are
+#  imported inside the page that needs them, see benchmarks/import_time.py)
 import database as db
+import profiling as prof
 
-# Initialize Database
-db.init_db()
+# Per-rerun profiling, switched on from the sidebar "Performance" toggle
+if st.session_state.get("perf_panel"):
+    prof.start_recording()
+else:
+    prof.stop_recording()
+
+# Writes are queued on a background writer; reads in this session wait for its own
+db.use_session(st.session_state.setdefault("db_session", uuid.uuid4().hex))
 
 # ==========================================
 # UI CONFIGURATION
@@ -24,57 +31,151 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Workspace: each one is a separate database file, so a session only ever
+# reads and locks its own team's data. Only existing workspaces can be picked;
+# new ones are created explicitly, so a typo never makes a database file.
+def create_workspace():
+    name = st.session_state["new_workspace"]
+    if name.strip():
+        slug = db.workspace_slug(name)
+        db.init_db(workspace=slug)
+        st.session_state["workspace_name"] = slug
+
+workspaces = db.list_workspaces()
+if st.session_state.get("workspace_name") not in workspaces:
+    st.session_state["workspace_name"] = db.DEFAULT_WORKSPACE
+workspace = st.sidebar.selectbox("🗂 Workspace", workspaces, key="workspace_name",
+                                 help="Each workspace has its own tasks.")
+with st.sidebar.expander("New workspace"):
+    with st.form("new_workspace_form", clear_on_submit=True, border=False):
+        st.text_input("Name", key="new_workspace", help="Lowercase letters, digits, '-' and '_'; other characters become '-'.")
+        st.form_submit_button("Create", on_click=create_workspace)
+db.use_workspace(workspace)
+
+# Initialize Database: migrations run once per process (and database file), not on every rerun
+@st.cache_resource(show_spinner=False)
+def init_schema(db_file):
+    db.init_db()
+
+init_schema(db.workspace_file(workspace))
+
+def saved(write):
+    """
+    Waits for a queued write to commit (group commit keeps this short) and says
+    whether it did; a failed write is shown as an error instead of rerunning.
+    """
+    try:
+        write.result()
+    except Exception as exc:
+        st.error(f"Couldn't save the change: {exc}")
+        return False
+    return True
+
 st.sidebar.title("Navigation")
 page = st.sidebar.radio("Go to:", ["Calendar Dashboard", "Analytics"])
+# Long lists (active tasks, resolutions, checklist days) render one page at a time
+page_size = st.sidebar.select_slider("Rows per page", options=[5, 10, 20, 50], value=10, key="page_size")
 
 # ==========================================
 # PAGE 1: CALENDAR DASHBOARD
 # ==========================================
 if page == "Calendar Dashboard":
+    from streamlit_calendar import calendar
+    from builders import (build_events, active_record_rows, resolution_rows, month_range, window_months, merge_months,
+                          page_bounds, PRIORITY_EMOJI, DEFAULT_EMOJI)
+    import recurrence
+
+    def load_page(key, **query):
+        """The page of tasks stored under key (LIMIT/OFFSET in SQL), clamped if the list shrank."""
+        page_no = st.session_state.get(key, 1)
+        result = db.get_task_page(limit=page_size, offset=(page_no - 1) * page_size, **query)
+        offset, clamped, _ = page_bounds(result.total, page_size, page_no)
+        if clamped != page_no:
+            st.session_state[key] = clamped
+            result = db.get_task_page(limit=page_size, offset=offset, **query)
+        return result
+
+    def page_picker(key, total):
+        """Page number input, shown only when a list overflows one page."""
+        pages = page_bounds(total, page_size, 1)[2]
+        if pages > 1:
+            st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=key)
+
     st.title("Task Master Pro 📅")
     col_cal, col_tools = st.columns([3, 1])
-    df = db.get_tasks_df()
     
     # --- 1. PREPARE DATA ---
-    res_tasks = df[df['task_type'] == 'resolution'] if not df.empty else pd.DataFrame()
-    
-    events = []
-    prio_colors = {"High": "#FF4B4B", "Medium": "#FFAA00", "Low": "#00CC96"}
+    # Only the visible month (plus one month either side, for the days the month
+    # grid shows around it) is loaded. streamlit_calendar doesn't report its own
+    # prev/next paging, so the month is picked with Streamlit buttons instead.
+    today = date.today()
+    vis_start, vis_end = st.session_state.get("cal_range", month_range(today))
+
+    def show_month(day):
+        st.session_state["cal_range"] = month_range(day)
+
+    # --- SIDEBAR SEARCH ---
+    # Ranked full-text search; picking a hit pages the calendar to that task's month.
+    SEARCH_PAGE_SIZE = 10
+
+    def reset_search_page():
+        # A new query or filter starts again from its first page of hits
+        st.session_state["search_page"] = 1
+
+    with st.sidebar:
+        st.divider()
+        query = st.text_input("🔍 Search tasks", key="search_q", placeholder="Name or description",
+                              on_change=reset_search_page)
+        if query.strip():
+            f1, f2 = st.columns(2)
+            s_prio = f1.selectbox("Priority", ["Any", "High", "Medium", "Low"], key="search_prio",
+                                  on_change=reset_search_page)
+            in_view = f2.checkbox("In view", key="search_in_view", help="Only tasks overlapping the visible calendar range",
+                                  on_change=reset_search_page)
+            page_no = st.session_state.get("search_page", 1)
+            hits = db.search_tasks(
+                query, limit=SEARCH_PAGE_SIZE + 1, offset=(page_no - 1) * SEARCH_PAGE_SIZE,
+                date_range=(vis_start, vis_end) if in_view else None,
+                priority=None if s_prio == "Any" else s_prio,
+            )
+            if not hits:
+                st.caption("No matching tasks.")
+            for hit in hits[:SEARCH_PAGE_SIZE]:
+                emoji = PRIORITY_EMOJI.get(hit.priority, DEFAULT_EMOJI)
+                if st.button(f"{emoji} {hit.name} · {hit.start_date:%b %d, %Y}", key=f"search_hit_{hit.id}",
+                             help=hit.description or None):
+                    st.session_state["cal_range"] = month_range(hit.start_date)
+                    st.rerun()
+            if page_no > 1 or len(hits) > SEARCH_PAGE_SIZE:
+                st.number_input("Results page", min_value=1, step=1, key="search_page")
+    cal_df = merge_months([db.get_events_in_range(first, last) for first, last in window_months(vis_start)])
+    res_page = load_page("res_page", kind="resolution")
     
-    if not df.empty:
-        cal_df = df[df['task_type'] != 'resolution']
-        for _, row in cal_df.iterrows():
-            s_date = row['start_date']
-            e_date = row['end_date'] + timedelta(days=1)
-            bg_color = prio_colors.get(row['priority'], "#3788d8")
-            title_prefix = "☑ " if row['is_daily'] else ""
-
-            events.append({
-                "title": f"{title_prefix}{row['name']} ({row['progress']}%)",
-                "start": str(s_date),
-                "end": str(e_date),
-                "backgroundColor": bg_color,
-                "borderColor": bg_color,
-                "extendedProps": {
-                    "id": row['id'],
-                    "desc": row['description'],
-                    "progress": row['progress'],
-                    "priority": row['priority'],
-                    "is_daily": row['is_daily'],
-                    "start": str(row['start_date']),
-                    "end": str(row['end_date'])
-                }
-            })
+    with prof.stage("dashboard.build_events") as stg:
+        events = build_events(cal_df)
+        stg.rows = len(events)
 
     cal_options = {
-        "headerToolbar": {"left": "prev,next today", "center": "title", "right": "dayGridMonth"},
+        "headerToolbar": {"left": "", "center": "title", "right": ""},
         "initialView": "dayGridMonth",
+        "initialDate": str(vis_start),
         "selectable": True,
     }
 
     # --- RENDER CALENDAR ---
     with col_cal:
-        cal_state = calendar(events=events, options=cal_options, key="main_cal")
+        nav_prev, nav_today, nav_next, _ = st.columns([1, 1, 1, 9])
+        nav_prev.button("◀", key="cal_prev", help="Previous month", on_click=show_month,
+                        args=(vis_start - timedelta(days=1),), width="stretch")
+        nav_today.button("Today", key="cal_today", on_click=show_month, args=(today,), width="stretch")
+        nav_next.button("▶", key="cal_next", help="Next month", on_click=show_month,
+                        args=(vis_end + timedelta(days=1),), width="stretch")
+        with prof.stage("dashboard.render_calendar"):
+            # initialDate only applies when the component mounts, so it is keyed by month
+            cal_state = calendar(
+                events=events, options=cal_options,
+                callbacks=["dateClick", "eventClick"], key=f"main_cal_{vis_start:%Y_%m}"
+            )
 
     # --- RENDER SIDEBAR (CARD VIEW) ---
     with col_tools:
@@ -82,14 +183,15 @@ if page == "Calendar Dashboard":
         # === CARD 1: RESOLUTIONS ===
         with st.container(border=True):
             st.subheader("🌟 Resolutions")
-            if not res_tasks.empty:
-                for _, row in res_tasks.iterrows():
-                    with st.expander(f"{row['name']} ({row['progress']}%)"):
+            if res_page.records:
+                for row in resolution_rows(res_page.records):
+                    with st.expander(row['label']):
                         st.caption(f"_{row['description']}_")
                         new_val = st.slider("Progress", 0, 100, row['progress'], key=f"res_s_{row['id']}")
                         if st.button("Save", key=f"res_b_{row['id']}"):
-                            db.update_task_progress(row['id'], new_val)
-                            st.rerun()
+                            if saved(db.update_task_progress(row['id'], new_val)):
+                                st.rerun()
+                page_picker("res_page", res_page.total)
             else:
                 st.caption("No resolutions yet.")
 
@@ -106,7 +208,7 @@ if page == "Calendar Dashboard":
                 task_id = props['id']
                 
                 # Check expiration
-                task_end_date = datetime.strptime(props['end'], "%Y-%m-%d").date()
+                task_end_date = date.fromisoformat(props['end'])
                 today_date = date.today()
                 is_expired = task_end_date < today_date
 
@@ -117,33 +219,47 @@ if page == "Calendar Dashboard":
                 else:
                     if props['is_daily']:
                         st.write("---")
-                        st.caption("Daily Checklist")
-                        s_d = datetime.strptime(props['start'], "%Y-%m-%d").date()
+                        rule = props.get('recurrence')
+                        st.caption(f"Checklist · {recurrence.rule_label(rule)}")
+                        s_d = date.fromisoformat(props['start'])
                         e_d = task_end_date
-                        delta = (e_d - s_d).days + 1
-                        status_map = db.get_daily_status_map(task_id)
-                        
-                        with st.container():
-                            for i in range(delta):
-                                day = s_d + timedelta(days=i)
-                                day_str = str(day)
-                                is_done = status_map.get(day_str, False)
+                        n_due = recurrence.count(rule, s_d, e_d)
+
+                        # One page of occurrences at a time, opening on the page that holds
+                        # today; only that page's days are expanded from the rule
+                        day_key = f"chk_page_{task_id}"
+                        if day_key not in st.session_state:
+                            st.session_state[day_key] = max(0, recurrence.count(rule, s_d, e_d, hi=today_date) - 1) // page_size + 1
+                        day_offset, day_page, _ = page_bounds(n_due, page_size, st.session_state[day_key])
+                        st.session_state[day_key] = day_page
+                        status_map = db.get_daily_status_map(
+                            task_id, recurrence.nth(rule, s_d, day_offset), recurrence.nth(rule, s_d, day_offset + page_size - 1))
+
+                        # Ticks are collected in a form and saved in one transaction / one rerun
+                        with st.form(f"checklist_{task_id}"):
+                            checked = {}
+                            for day_str, done in status_map.items():
                                 chk_key = f"chk_{task_id}_{day_str}"
-                                new_status = st.checkbox(day.strftime("%a, %b %d"), value=is_done, key=chk_key)
-                                if new_status != is_done:
-                                    db.toggle_daily_status(task_id, day_str, new_status)
+                                label = date.fromisoformat(day_str).strftime("%a, %b %d")
+                                checked[day_str] = st.checkbox(label, value=done, key=chk_key)
+                            if st.form_submit_button("Save Checklist"):
+                                changes = {d: v for d, v in checked.items() if v != status_map[d]}
+                                if changes and saved(db.set_daily_statuses(task_id, changes)):
                                     st.rerun()
+                        if n_due > page_size:
+                            st.caption("Save before changing page; unsaved ticks are dropped.")
+                            page_picker(day_key, n_due)
                     else:
                         new_prog = st.slider("Progress %", 0, 100, props['progress'], key="edit_slider")
                         if st.button("Save"):
-                            db.update_task_progress(task_id, new_prog)
-                            st.rerun()
+                            if saved(db.update_task_progress(task_id, new_prog)):
+                                st.rerun()
                 
                 st.divider()
                 col_d1, col_d2 = st.columns(2)
                 if col_d1.button("🗑️ Delete"):
-                    db.delete_task(task_id)
-                    st.rerun()
+                    if saved(db.delete_task(task_id)):
+                        st.rerun()
                 if col_d2.button("Close"):
                     st.rerun()
 
@@ -156,7 +272,7 @@ if page == "Calendar Dashboard":
                 if cal_state.get("dateClick"):
                     raw_date = cal_state["dateClick"]["date"]
                     date_str = raw_date.split("T")[0]
-                    start_default = datetime.strptime(date_str, "%Y-%m-%d").date()
+                    start_default = date.fromisoformat(date_str)
 
                 end_default = pkg_end if pkg_end else (start_default + timedelta(days=4))
                 is_end_locked = True if pkg_end else False
@@ -175,52 +291,47 @@ if page == "Calendar Dashboard":
                         d_start = st.date_input("Start", start_default)
                         d_end = st.date_input("End", end_default, disabled=is_end_locked)
                         
-                        is_daily = st.checkbox("Daily Checklist?", value=False)
+                        t_rule = st.selectbox("Checklist", (None,) + recurrence.RULE_CHOICES,
+                                              format_func=lambda r: recurrence.rule_label(r) if r else "None",
+                                              help="Repeating tasks get a checkbox per occurrence; progress follows the ticks.")
                         
                         if st.form_submit_button("Add Task"):
                             if d_end < d_start:
                                 st.error("End Date cannot be before Start Date.")
                             elif not t_name:
                                 st.error("Name required")
-                            else:
-                                db.add_task_to_db(t_name, t_desc, t_prio, d_start, d_end, "regular", is_daily)
+                            elif saved(db.add_task_to_db(t_name, t_desc, t_prio, d_start, d_end, "regular", bool(t_rule), t_rule)):
                                 st.success("Added!")
                                 st.rerun()
 
             # --- C. ACTIVE TASKS LIST (Beautified) ---
-            if not df.empty:
-                reg_df = df[df['task_type'] != 'resolution']
-                today_date = date.today()
-                
-                # Filter for active tasks (End date is today or future)
-                active_cycle_df = reg_df[reg_df['end_date'] >= today_date] if not reg_df.empty else pd.DataFrame()
+            if db.has_regular_tasks():
+                # Active tasks: end date is today or in the future, one page at a time
+                active_page = load_page("act_page", kind="regular", active_on=date.today())
 
-                if not active_cycle_df.empty:
+                if active_page.records:
                     st.divider()
-                    st.caption("Active Tasks Status")
-                    
-                    # Sort by Priority then Progress
-                    active_cycle_df['prio_val'] = pd.Categorical(active_cycle_df['priority'], ["High", "Medium", "Low"])
-                    active_cycle_df = active_cycle_df.sort_values(by=["prio_val", "progress"])
+                    st.caption(f"Active Tasks Status ({active_page.total})")
                     
-                    for _, row in active_cycle_df.iterrows():
-                        # Priority Color Indicator
-                        p_emoji = "🔴" if row['priority'] == "High" else "🟡" if row['priority'] == "Medium" else "🟢"
-                        
-                        with st.expander(f"{p_emoji} {row['name']} ({row['progress']}%)"):
+                    # Sorted by Priority then Progress (in SQL), with priority color indicator
+                    with prof.stage("dashboard.active_task_rows") as stg:
+                        active_rows = active_record_rows(active_page.records)
+                        stg.rows = len(active_rows)
+                    for row in active_rows:
+                        with st.expander(row['label']):
                             if row['description']:
                                 st.caption(f"_{row['description']}_")
                             
                             st.caption(f"📅 Due: {row['end_date']}")
                             
-                            new_val = st.slider("Progress", 0, 100, int(row['progress']), key=f"act_s_{row['id']}")
+                            new_val = st.slider("Progress", 0, 100, row['progress'], key=f"act_s_{row['id']}")
                             if st.button("Update", key=f"act_b_{row['id']}"):
-                                db.update_task_progress(row['id'], new_val)
-                                st.rerun()
+                                if saved(db.update_task_progress(row['id'], new_val)):
+                                    st.rerun()
+                    page_picker("act_page", active_page.total)
                 else:
-                    if not reg_df.empty:
-                        st.divider()
-                        st.caption("No active tasks.")
+                    st.divider()
+                    st.caption("No active tasks.")
 
 # ==========================================
 # PAGE 2: ANALYTICS
@@ -239,21 +350,21 @@ elif page == "Analytics":
         lock_date = date(2026, 1, 3)
         can_edit = date.today() <= lock_date
 
-        res_df = db.get_resolutions_df()
+        res_records = db.get_task_records("resolution")
 
-        if not res_df.empty:
+        if res_records:
             st.subheader("Your Goals")
-            for _, row in res_df.iterrows():
+            for row in res_records:
                 col1, col2 = st.columns([5, 1])
                 with col1:
-                    st.markdown(f"🎯 **{row['name']}**")
-                    if row['description']:
-                        st.caption(f"_{row['description']}_")
+                    st.markdown(f"🎯 **{row.name}**")
+                    if row.description:
+                        st.caption(f"_{row.description}_")
                 with col2:
                     if can_edit:
-                        if st.button("🗑️", key=f"del_res_{row['id']}"):
-                            db.delete_task(row['id'])
-                            st.rerun()
+                        if st.button("🗑️", key=f"del_res_{row.id}"):
+                            if saved(db.delete_task(row.id)):
+                                st.rerun()
                     else:
                         st.caption("🔒 Locked")
             st.divider()
@@ -268,9 +379,9 @@ elif page == "Analytics":
                     if r_name:
                         s_26 = date(2026, 1, 1)
                         e_26 = date(2026, 12, 31)
-                        db.add_task_to_db(r_name, r_desc, "High", s_26, e_26, "resolution", False)
-                        st.session_state['res_success'] = True
-                        st.rerun()
+                        if saved(db.add_task_to_db(r_name, r_desc, "High", s_26, e_26, "resolution", False)):
+                            st.session_state['res_success'] = True
+                            st.rerun()
                     else:
                         st.error("Please enter a name for your resolution.")
         else:
@@ -278,37 +389,22 @@ elif page == "Analytics":
             
     st.divider()
     
-    df = db.get_tasks_df()
-    if not df.empty:
-        # Filter regular tasks
-        reg_df = df[df['task_type'] != 'resolution'].copy()
+    sprint_df = db.sprint_summary()
+    if not sprint_df.empty or res_records:
         
-        if not reg_df.empty:
-            
-            # --- 1. SPRINT CALCULATION LOGIC ---
-            reg_df['end_date'] = pd.to_datetime(reg_df['end_date'])
-            sprint_groups = reg_df.groupby('end_date')
+        if not sprint_df.empty:
             
-            sprint_data = []
-            
-            for i, (end_dt, group) in enumerate(sorted(sprint_groups)):
-                sprint_num = i + 1
-                avg_eff = group['progress'].mean()
-                task_count = len(group)
-                sprint_data.append({
-                    "Sprint": f"Sprint {sprint_num}",
-                    "End Date": end_dt.strftime("%Y-%m-%d"),
-                    "Efficiency": int(avg_eff),
-                    "Tasks": task_count,
-                    "Data": group
-                })
-            
-            sprint_df = pd.DataFrame(sprint_data)
+            # --- 1. SPRINT SUMMARY (aggregated in SQL, one row per sprint) ---
+            from builders import sprint_frame
+            import reports
+            with prof.stage("analytics.sprint_prep") as stg:
+                sprint_df = sprint_frame(sprint_df)
+                stg.rows = len(sprint_df)
             
             # --- 2. HEADER METRICS ---
-            total = len(reg_df)
-            completed = len(reg_df[reg_df['progress'] == 100])
-            avg_sprint_eff = sprint_df['Efficiency'].mean() if not sprint_df.empty else 0
+            total = int(sprint_df['Tasks'].sum())
+            completed = int(sprint_df['Completed'].sum())
+            avg_sprint_eff = sprint_df['Efficiency'].mean()
             
             c1, c2, c3 = st.columns(3)
             c1.metric("Total Tasks", total)
@@ -318,64 +414,77 @@ elif page == "Analytics":
             st.divider()
             
             # --- 3. CHARTS ---
+            with prof.stage("analytics.import_plotly"):
+                import plotly.graph_objects as go
+            
             col_g1, col_g2 = st.columns(2)
             
             with col_g1:
                 st.subheader("Efficiency (Last 7 Sprints)")
                 if not sprint_df.empty:
                     recent_sprints = sprint_df.tail(7)
-                    fig_sprint = px.bar(
-                        recent_sprints,
-                        x="Sprint",
-                        y="Efficiency",
-                        text="Efficiency",
-                        color="Efficiency",
-                        color_continuous_scale="Blues",
-                        range_y=[0, 100]
-                    )
-                    fig_sprint.update_traces(texttemplate='%{text}%', textposition='outside')
-                    fig_sprint.update_layout(height=300, margin=dict(t=30, b=10, l=10, r=10), coloraxis_showscale=False)
+                    with prof.stage("analytics.figure_sprint_bar"):
+                        fig_sprint = reports.efficiency_figure(recent_sprints)
                     st.plotly_chart(fig_sprint, use_container_width=True)
                 else:
                     st.info("No sprints found.")
 
             with col_g2:
                 st.subheader("Current Sprint Status")
-                if sprint_data:
-                    latest_sprint = sprint_data[-1] 
-                    ls_df = latest_sprint['Data']
-                    
-                    done_count = len(ls_df[ls_df['progress'] == 100])
-                    pending_count = len(ls_df[ls_df['progress'] < 100])
-                    
-                    pie_data = pd.DataFrame({
-                        "Status": ["Completed", "Pending"],
-                        "Count": [done_count, pending_count]
-                    })
-                    
-                    fig_pie = px.pie(
-                        pie_data, 
-                        values='Count', 
-                        names='Status',
-                        color='Status',
-                        color_discrete_map={"Completed": "#00CC96", "Pending": "#FF4B4B"},
-                        hole=0.4
-                    )
-                    fig_pie.update_layout(
-                        height=300, 
-                        margin=dict(t=10, b=10, l=10, r=10),
-                        showlegend=True,
-                        annotations=[dict(text=f"{latest_sprint['Sprint']}", x=0.5, y=0.5, font_size=14, showarrow=False)]
-                    )
+                if not sprint_df.empty:
+                    with prof.stage("analytics.figure_status_pie"):
+                        fig_pie = reports.status_figure(sprint_df.iloc[-1])
                     st.plotly_chart(fig_pie, use_container_width=True)
                 else:
                     st.info("No active sprint data.")
             
-            # --- 4. EXPANDABLE SPRINT LIST ---
+            # --- 4. DAILY HABITS (read from the materialized daily_stats / task_streaks) ---
+            today = date.today()
+            streaks = db.get_streaks(today)
+            day_stats = db.get_daily_stats(today - timedelta(days=371), today)
+            if streaks or day_stats:
+                st.subheader("Daily Habits")
+                import recurrence
+                h1, h2, h3 = st.columns(3)
+                # Streaks count occurrences, so each is labelled in its task's unit (days, weeks...)
+                # and the best is picked by days covered (get_streaks ranks current streaks that way)
+                best = streaks[0] if streaks else None
+                h1.metric("Current Streak", recurrence.run_label(best.recurrence, best.current) if best else "0 days",
+                          help=best.name if best else None)
+                longest = max(streaks, key=lambda r: recurrence.run_days(r.recurrence, r.longest)) if streaks else None
+                h2.metric("Longest Streak", recurrence.run_label(longest.recurrence, longest.longest) if longest else "0 days",
+                          help=longest.name if longest else None)
+                year_days = [v for k, v in day_stats.items() if k > str(today - timedelta(days=365))]
+                h3.metric("Perfect Days (1y)", sum(1 for done, total in year_days if total and done == total))
+
+                from builders import heatmap_grid
+                with prof.stage("analytics.figure_heatmap") as stg:
+                    z, hover, week_starts = heatmap_grid(day_stats, today)
+                    fig_heat = go.Figure(go.Heatmap(
+                        z=z, x=week_starts, y=["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+                        text=hover, hoverinfo="text", zmin=0, zmax=1, xgap=3, ygap=3,
+                        colorscale=[[0, "#ebedf0"], [0.01, "#9be9a8"], [0.5, "#40c463"], [1, "#216e39"]],
+                        showscale=False,
+                    ))
+                    fig_heat.update_layout(height=200, margin=dict(t=10, b=10, l=10, r=10),
+                                           yaxis=dict(autorange="reversed"), plot_bgcolor="rgba(0,0,0,0)")
+                    stg.rows = len(day_stats)
+                st.plotly_chart(fig_heat, use_container_width=True)
+                if streaks:
+                    with st.expander("Streaks by task"):
+                        st.dataframe(
+                            [{"Task": r.name, "Repeats": recurrence.rule_label(r.recurrence),
+                              "Current": recurrence.run_label(r.recurrence, r.current),
+                              "Longest": recurrence.run_label(r.recurrence, r.longest), "Last Ticked": r.run_end}
+                             for r in streaks],
+                            use_container_width=True, hide_index=True
+                        )
+
+            # --- 5. EXPANDABLE SPRINT LIST ---
             st.subheader("Sprint Details")
             st.caption("Click on a row to expand details.")
 
-            for item in reversed(sprint_data):
+            for item in sprint_df.iloc[::-1].to_dict("records"):
                 s_name = item['Sprint']
                 s_eff = item['Efficiency']
                 s_date = item['End Date']
@@ -385,13 +494,63 @@ elif page == "Analytics":
                 label = f"{emoji} {s_name} │ 📅 Ends: {s_date} │ 📊 Efficiency: {s_eff}% │ 📝 {s_count} Tasks"
                 
                 with st.expander(label):
-                    sub_df = item['Data'][['name', 'start_date', 'end_date', 'progress', 'priority']].copy()
-                    sub_df['start_date'] = pd.to_datetime(sub_df['start_date']).dt.date
-                    sub_df['end_date'] = pd.to_datetime(sub_df['end_date']).dt.date
-                    
-                    st.dataframe(sub_df, use_container_width=True, hide_index=True)
+                    # Expander bodies always execute, so task rows load only on request
+                    if st.toggle("Show tasks", key=f"sprint_tasks_{s_date}"):
+                        sub_df = db.get_sprint_tasks(s_date)
+                        st.dataframe(sub_df, use_container_width=True, hide_index=True)
+
+            # --- 6. REPORT EXPORT (rendered in worker processes, see reports.py) ---
+            st.subheader("Export Report")
+            f_col, b_col = st.columns([2, 1])
+            report_fmt = f_col.radio("Format", reports.available_formats(), format_func=str.upper,
+                                     horizontal=True, key="report_fmt", label_visibility="collapsed")
+            if b_col.button("📄 Export", key="report_export", width="stretch"):
+                st.session_state["report_job"] = reports.start_report(report_fmt)
+
+            job = st.session_state.get("report_job")
+            if job is not None and job.workspace == workspace:
+                # Polls the job while it runs; only this fragment reruns, not the page
+                polling = job.running
+                @st.fragment(run_every=0.5 if polling else None)
+                def report_status():
+                    if polling and not job.running:
+                        st.rerun()      # once, to stop polling
+                    if job.running:
+                        st.progress(job.progress, text=job.stage)
+                    elif job.error:
+                        st.error(f"Report failed: {job.error}")
+                    else:
+                        st.download_button(f"⬇️ Download {job.filename} ({len(job.data) / 1024:,.0f} KB)",
+                                           job.data, job.filename, job.mime, key="report_download")
+                        st.caption(f"Built in {job.elapsed:.1f}s. Exporting again before the data changes reuses it.")
+                report_status()
             
         else:
             st.info("No regular tasks found in package.")
     else:
-        st.info("No data yet.")
\ No newline at end of file
+        st.info("No data yet.")
+
+# ==========================================
+# PERFORMANCE PANEL (optional)
+# ==========================================
+st.sidebar.divider()
+st.sidebar.toggle("⏱ Performance", key="perf_panel", help="Time database calls and page stages for each rerun")
+recorder = prof.current_recorder()
+if recorder is not None:
+    with st.sidebar.expander("This rerun", expanded=True):
+        summary = recorder.summary()
+        st.caption(f"{len(recorder.spans)} spans │ {recorder.total_ms('db.'):.1f} ms in database calls")
+        st.dataframe(
+            [{k: round(v, 2) if isinstance(v, float) else v for k, v in row.items()} for row in summary],
+            column_order=["name", "count", "total_ms", "mean_ms", "max_ms", "rows"],
+            use_container_width=True, hide_index=True
+        )
+        cache = db.cache_stats()
+        st.caption(f"Read cache: {cache['hits']} hits / {cache['misses']} misses")
+        writes = db.writer_stats()
+        if writes:
+            st.caption(f"Writer: {writes['ops']} ops in {writes['batches']} commits "
+                       f"({writes['ops_per_commit']:.1f}/commit), {writes['queued']} queued")
+        col_j, col_t = st.columns(2)
+        col_j.download_button("JSON", recorder.to_json(), "rerun_profile.json", "application/json")
+        col_t.download_button("Chrome trace", recorder.to_chrome_trace(), "rerun_trace.json", "application/json")
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Benchmark: iterrows() calendar event construction (the old app.py loop) vs. the
+column-wise builder in builders.py, on synthetic task frames. (The sidebar's
+active list is paged in SQL now; see bench_paging.py.)
+
+Usage:  python benchmarks/bench_builders.py [--sizes 10000 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import builders
+
+def synthetic_tasks(n, seed=0):
+    rng = random.Random(seed)
+    today = date.today()
+    starts = [today - timedelta(days=rng.randrange(365)) for _ in range(n)]
+    return pd.DataFrame({
+        "id": range(1, n + 1),
+        "name": [f"Task {i}" for i in range(n)],
+        "description": ["" if i % 3 else "notes" for i in range(n)],
+        "priority": [rng.choice(("High", "Medium", "Low")) for _ in range(n)],
+        "start_date": starts,
+        "end_date": [s + timedelta(days=rng.randrange(14)) for s in starts],
+        "progress": [rng.randrange(101) for _ in range(n)],
+        "task_type": "regular",
+        "is_daily": [i % 4 == 0 for i in range(n)],
+        "recurrence": ["daily" if i % 4 == 0 else None for i in range(n)],
+    })
+
+def legacy_events(df):
+    prio_colors = {"High": "#FF4B4B", "Medium": "#FFAA00", "Low": "#00CC96"}
+    events = []
+    for _, row in df.iterrows():
+        e_date = row['end_date'] + timedelta(days=1)
+        bg_color = prio_colors.get(row['priority'], "#3788d8")
+        title_prefix = "☑ " if row['is_daily'] else ""
+        events.append({
+            "title": f"{title_prefix}{row['name']} ({row['progress']}%)",
+            "start": str(row['start_date']),
+            "end": str(e_date),
+            "backgroundColor": bg_color,
+            "borderColor": bg_color,
+            "extendedProps": {
+                "id": row['id'], "desc": row['description'], "progress": row['progress'],
+                "priority": row['priority'], "is_daily": row['is_daily'],
+                "start": str(row['start_date']), "end": str(row['end_date']),
+            },
+        })
+    return events
+
+def _best(fn, arg, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'stage':<14}{'iterrows ms':>13}{'builder ms':>12}{'speedup':>9}")
+    for n in args.sizes:
+        df = synthetic_tasks(n)
+        assert [e["title"] for e in legacy_events(df.head(500))] == \
+               [e["title"] for e in builders.build_events(df.head(500))]
+        t_old, t_new = _best(legacy_events, df), _best(builders.build_events, df)
+        print(f"{n:>8,} {'events':<14}{t_old:>13.0f}{t_new:>12.0f}{t_old / t_new:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
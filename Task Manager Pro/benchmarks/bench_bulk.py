@@ -0,0 +1,83 @@
+"""
+Benchmark: loading a year of history row by row through the public write API
+vs. import_tasks(), plus a full export/restore round trip in each format.
+
+Usage:  python benchmarks/bench_bulk.py [--tasks 5000] [--daily 200] [--formats csv jsonl parquet]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+
+def year_of_history(n_tasks, n_daily, seed=0):
+    """(tasks, logs) as dict rows: weekly sprints plus n_daily year-long daily tasks."""
+    rng = random.Random(seed)
+    origin = date(date.today().year - 1, 1, 1)
+    tasks, logs = [], []
+    for i in range(1, n_tasks + 1):
+        daily = i <= n_daily
+        start = origin if daily else origin + timedelta(days=7 * rng.randrange(52))
+        end = start + timedelta(days=364 if daily else 6)
+        tasks.append({"id": i, "name": f"Task {i}", "description": "", "priority": rng.choice(("High", "Medium", "Low")),
+                      "start_date": str(start), "end_date": str(end), "progress": 0 if daily else rng.randrange(101),
+                      "task_type": "regular", "is_daily": int(daily), "created_at": str(start)})
+        if daily:
+            logs.extend({"task_id": i, "log_date": str(start + timedelta(days=d)), "is_complete": int(rng.random() < 0.7)}
+                        for d in range(365))
+    return tasks, logs
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def _row_by_row(tasks, logs):
+    for t in tasks:
+        db.add_task_to_db(t["name"], t["description"], t["priority"], t["start_date"], t["end_date"],
+                          t["task_type"], t["is_daily"])
+    last = None
+    for log in logs:
+        last = db.toggle_daily_status(log["task_id"], log["log_date"], log["is_complete"])
+    # Writes apply in order, so the last one committing means they all have
+    if last is not None:
+        last.result()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--daily", type=int, default=200, help="year-long daily tasks among --tasks")
+    parser.add_argument("--formats", nargs="+", default=["csv", "jsonl", "parquet"])
+    args = parser.parse_args()
+
+    tasks, logs = year_of_history(args.tasks, args.daily)
+    print(f"{len(tasks):,} tasks, {len(logs):,} daily logs")
+    with tempfile.TemporaryDirectory() as workdir:
+        db.DB_FILE = os.path.join(workdir, "rows.db")
+        db.init_db()
+        _, t_rows = _timed(lambda: _row_by_row(tasks, logs))
+        print(f"{'row-by-row API':<22}{t_rows:>8.2f}s")
+
+        db.DB_FILE = os.path.join(workdir, "bulk.db")
+        db.init_db()
+        _, t_bulk = _timed(lambda: db.import_tasks(iter(tasks), iter(logs)).result())
+        print(f"{'import_tasks':<22}{t_bulk:>8.2f}s  ({t_rows / t_bulk:.0f}x)")
+
+        for fmt in args.formats:
+            db.DB_FILE = os.path.join(workdir, "bulk.db")
+            path = os.path.join(workdir, f"backup.{fmt}")
+            _, t_export = _timed(lambda: db.export_tasks(path))
+            size = (os.path.getsize(path) + os.path.getsize(db.logs_path(path))) / 2 ** 20
+            db.DB_FILE = os.path.join(workdir, f"restore_{fmt}.db")
+            db.init_db()
+            _, t_restore = _timed(lambda: db.import_tasks(path).result())
+            print(f"{fmt:<8} export {t_export:>6.2f}s  restore {t_restore:>6.2f}s  {size:>7.1f} MB")
+        db.get_pool().close()
+
+if __name__ == "__main__":
+    main()
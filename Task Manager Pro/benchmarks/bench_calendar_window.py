@@ -0,0 +1,85 @@
+"""
+Benchmark: calendar feed for one visible month (plus the month either side)
+vs. the full task history, as the history grows, and the cost of paging to
+the next month once the current window is cached.
+
+Usage:  python benchmarks/bench_calendar_window.py [--sizes 1000 10000 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import builders
+import database as db
+
+def _seed(n_tasks, seed=0):
+    rng = random.Random(seed)
+    today = date.today()
+    rows = []
+    for i in range(n_tasks):
+        # History reaches further back as it grows: ~10 tasks per week
+        start = today - timedelta(days=rng.randrange(max(30, n_tasks // 10 * 7)))
+        end = start + timedelta(days=rng.randrange(1, 14))
+        rows.append((f"Task {i}", "", rng.choice(("High", "Medium", "Low")), str(start), str(end),
+                     rng.randrange(101), "regular", 0, str(start)))
+    db._submit(db._executemany, '''
+        INSERT INTO tasks (name, description, priority, start_date, end_date, progress, task_type, is_daily, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows).result()
+
+def _measure(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        db.read_cache.invalidate()
+        start = time.perf_counter()
+        df = fn()
+        payload = df.to_json(orient="records", date_format="iso")
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(df), len(payload)
+
+def _window(day):
+    """What the dashboard reads for the month holding day: three cached month reads, merged."""
+    return builders.merge_months([db.get_events_in_range(*m) for m in builders.window_months(day)])
+
+def _page_next(day, repeat=5):
+    """(best ms, month reads served from cache) for a ▶ click with day's window already loaded."""
+    next_month = builders.month_range(day)[1] + timedelta(days=1)
+    best = float("inf")
+    for _ in range(repeat):
+        db.read_cache.invalidate()
+        _window(day)
+        hits = db.read_cache.hits
+        start = time.perf_counter()
+        _window(next_month)
+        best = min(best, time.perf_counter() - start)
+        cached = db.read_cache.hits - hits
+    return best * 1000, cached
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+
+    today = date.today()
+
+    print(f"{'tasks':>8} | {'full ms':>8}{'rows':>8}{'KB':>8} | {'window ms':>10}{'rows':>8}{'KB':>8} | "
+          f"{'next month ms':>14}{'cached':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            db.DB_FILE = os.path.join(workdir, f"cal_{n}.db")
+            db.init_db()
+            _seed(n)
+            full = _measure(lambda: db.get_tasks_df())
+            window = _measure(lambda: _window(today))
+            paged_ms, cached = _page_next(today)
+            print(f"{n:>8,} | {full[0]:>8.1f}{full[1]:>8,}{full[2] / 1024:>8.0f} | "
+                  f"{window[0]:>10.1f}{window[1]:>8,}{window[2] / 1024:>8.0f} | {paged_ms:>14.1f}{cached:>6}/3")
+        db.get_pool().close()
+
+if __name__ == "__main__":
+    main()
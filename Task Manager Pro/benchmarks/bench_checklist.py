@@ -0,0 +1,82 @@
+"""
+Benchmark: end-to-end cost of ticking k checklist days — one write plus one
+simulated dashboard rerun per checkbox (the old flow) vs. a single batched
+set_daily_statuses() call followed by one rerun.
+
+Usage:  python benchmarks/bench_checklist.py [--days 1 5 30] [--history 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import builders
+import database as db
+
+def _seed(n_tasks, seed=0):
+    rng = random.Random(seed)
+    today = date.today()
+    tasks = [{"name": "Habit", "start_date": str(today - timedelta(days=180)),
+              "end_date": str(today + timedelta(days=184)), "is_daily": 1}]
+    for i in range(n_tasks):
+        start = today - timedelta(days=rng.randrange(3 * 365))
+        tasks.append({"name": f"Task {i}", "priority": "Medium", "start_date": str(start),
+                      "end_date": str(start + timedelta(days=6))})
+    db.import_tasks(tasks)
+    return 1
+
+def _rerun(task_id):
+    """The database/data-prep work of one Calendar Dashboard rerun with a daily task open."""
+    db.init_db()
+    vis = builders.month_range(date.today())
+    builders.build_events(builders.merge_months([db.get_events_in_range(*m) for m in builders.window_months(vis[0])]))
+    builders.resolution_rows(db.get_task_records("resolution"))
+    builders.active_record_rows(db.get_task_page("regular", 10, 0, active_on=date.today()).records)
+    db.get_package_dates()
+    db.get_daily_status_map(task_id)
+
+def _days(k, offset):
+    start = date.today() - timedelta(days=180)
+    return [str(start + timedelta(days=offset + i)) for i in range(k)]
+
+def per_checkbox(task_id, days):
+    for day in days:
+        db.toggle_daily_status(task_id, day, True)
+        _rerun(task_id)
+
+def batched(task_id, days):
+    db.set_daily_statuses(task_id, {day: True for day in days})
+    _rerun(task_id)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 5, 30])
+    parser.add_argument("--history", type=int, default=20_000, help="other tasks in the database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db.DB_FILE = os.path.join(workdir, "checklist.db")
+        db.init_db()
+        task_id = _seed(args.history)
+        _rerun(task_id)
+
+        print(f"{'days ticked':>12}{'per-checkbox ms':>17}{'batched ms':>12}{'speedup':>9}")
+        offset = 0
+        for k in args.days:
+            timings = []
+            for flow in (per_checkbox, batched):
+                days = _days(k, offset)
+                offset += k
+                start = time.perf_counter()
+                flow(task_id, days)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{k:>12}{timings[0]:>17.1f}{timings[1]:>12.1f}{timings[0] / timings[1]:>8.1f}x")
+        assert db.recompute_all_progress(verify_only=True) == 0
+        db.get_pool().close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: building the Analytics habit heatmap and streaks from the
+materialized daily_stats/task_streaks tables vs. aggregating every ticked day
+with pandas, and what keeping the tables current adds to a checkbox write.
+
+Usage:  python benchmarks/bench_daily_stats.py [--tasks 20000] [--daily-density 0.3]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import builders
+import database as db
+import recurrence
+from synth import generate_db
+
+def _ticked_days(conn):
+    """One (task_id, log_date) row per ticked day, expanded from the completion bitmaps."""
+    return pd.DataFrame(
+        [(task_id, str(day)) for task_id, _, start, end, bits in db._recurring_tasks(conn)
+         for day in recurrence.done_days(start, end, bits)],
+        columns=["task_id", "log_date"])
+
+def pandas_heatmap(today):
+    """The on-the-fly version: every ticked day and every daily task, aggregated per day and per task."""
+    with db._connect() as conn:
+        done = _ticked_days(conn)
+        tasks = pd.read_sql_query("SELECT id, start_date, end_date FROM tasks WHERE is_daily = 1", conn)
+    spans = tasks.assign(day=[pd.date_range(s, e).strftime("%Y-%m-%d") for s, e in zip(tasks.start_date, tasks.end_date)])
+    totals = spans.explode("day").groupby("day").size()
+    completed = done.groupby("log_date").size()
+    stats = {d: (int(completed.get(d, 0)), int(n)) for d, n in totals.items()}
+    done = done.sort_values(["task_id", "log_date"])
+    island = pd.to_datetime(done.log_date).map(pd.Timestamp.toordinal) - done.groupby("task_id").cumcount()
+    runs = done.groupby([done.task_id, island]).size()
+    runs.groupby(level=0).max()
+    return builders.heatmap_grid(stats, today)
+
+def materialized_heatmap(today):
+    db.get_streaks(today)
+    return builders.heatmap_grid(db.get_daily_stats(today - timedelta(days=371), today), today)
+
+def _best_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        db.read_cache.invalidate()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--daily-density", type=float, default=0.3)
+    parser.add_argument("--toggles", type=int, default=500)
+    args = parser.parse_args()
+
+    today = date.today()
+    with tempfile.TemporaryDirectory() as workdir:
+        generate_db(os.path.join(workdir, "stats.db"), tasks=args.tasks, daily_density=args.daily_density)
+        with db._connect() as conn:
+            n_done = len(_ticked_days(conn))
+        print(f"{args.tasks:,} tasks, {n_done:,} ticked days")
+        print(f"{'heatmap + streaks':<28}{'ms':>10}")
+        for name, fn in (("pandas over ticked days", pandas_heatmap), ("materialized tables", materialized_heatmap)):
+            print(f"{name:<28}{_best_ms(lambda: fn(today)):>10.1f}")
+
+        # Write cost: the bitmap write alone vs. the full operation (progress, stats, streak)
+        rng = random.Random(0)
+        daily = [r for r in db.get_task_records("regular") if r.is_daily]
+        picks = [(t.id, str(t.start_date + timedelta(days=rng.randrange((t.end_date - t.start_date).days + 1))))
+                 for t in rng.choices(daily, k=args.toggles)]
+        bitmap_only = '''
+            INSERT INTO task_completions (task_id, bits) VALUES (?, ?)
+            ON CONFLICT(task_id) DO UPDATE SET bits = excluded.bits
+        '''
+        cases = (
+            ("bitmap upsert only", lambda t, d: db._submit(db._execute, bitmap_only, (t, b"\x01")).result()),
+            ("toggle_daily_status", lambda t, d: db.toggle_daily_status(t, d, False).result()),
+        )
+        print(f"{'checkbox write':<28}{'us/op':>10}")
+        for name, fn in cases:
+            start = time.perf_counter()
+            for task_id, day in picks:
+                fn(task_id, day)
+            print(f"{name:<28}{(time.perf_counter() - start) / len(picks) * 1e6:>10.0f}")
+        db.flush_writes()
+        db.get_pool().close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: hot lookups on a large synthetic database before and after the
+schema migrations (secondary indexes, UNIQUE(task_id, log_date), cascade).
+
+Usage:  python benchmarks/bench_indexes.py [--tasks 100000] [--logs 5000000] [--repeat 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+
+LOGS_SCHEMA = 3     # last schema version with a daily_logs table
+
+def build_legacy_db(path, n_tasks, n_logs, seed=0):
+    """Creates a version-0 database (no indexes) with daily logs spread over the daily tasks."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    db.create_base_schema(conn)
+    origin = date.today() - timedelta(days=365 * 3)
+    daily_ids = []
+
+    def tasks():
+        for i in range(1, n_tasks + 1):
+            start = origin + timedelta(days=rng.randrange(365 * 3))
+            end = start + timedelta(days=rng.randrange(1, 60))
+            t_type = "resolution" if i % 50 == 0 else "regular"
+            is_daily = t_type == "regular" and i % 3 == 0
+            if is_daily:
+                daily_ids.append((i, start, (end - start).days + 1))
+            yield (i, f"Task {i}", "", rng.choice(("High", "Medium", "Low")), str(start), str(end),
+                   rng.randrange(101), t_type, int(is_daily), str(start))
+
+    conn.executemany('INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', tasks())
+
+    def logs():
+        produced = 0
+        while produced < n_logs:
+            for task_id, start, span in daily_ids:
+                for offset in range(span):
+                    yield (task_id, str(start + timedelta(days=offset)), rng.random() < 0.7)
+                    produced += 1
+                    if produced >= n_logs:
+                        return
+
+    conn.executemany('INSERT INTO daily_logs (task_id, log_date, is_complete) VALUES (?, ?, ?)', logs())
+    conn.commit()
+    conn.close()
+    return daily_ids
+
+def _time(conn, fn, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        fn(conn, *args)
+    conn.commit()
+    return (time.perf_counter() - start) / len(args_list) * 1000
+
+def _legacy_toggle(conn, task_id, day):
+    row = conn.execute('SELECT id FROM daily_logs WHERE task_id = ? AND log_date = ?', (task_id, day)).fetchone()
+    if row:
+        conn.execute('UPDATE daily_logs SET is_complete = 1 WHERE id = ?', (row[0],))
+    else:
+        conn.execute('INSERT INTO daily_logs (task_id, log_date, is_complete) VALUES (?, ?, 1)', (task_id, day))
+
+def _upsert_toggle(conn, task_id, day):
+    conn.execute('''
+        INSERT INTO daily_logs (task_id, log_date, is_complete) VALUES (?, ?, 1)
+        ON CONFLICT(task_id, log_date) DO UPDATE SET is_complete = excluded.is_complete
+    ''', (task_id, day))
+
+def _status_map(conn, task_id):
+    conn.execute('SELECT log_date, is_complete FROM daily_logs WHERE task_id = ?', (task_id,)).fetchall()
+
+def _resolutions(conn):
+    conn.execute("SELECT * FROM tasks WHERE task_type = 'resolution'").fetchall()
+
+def _legacy_package_dates(conn):
+    conn.execute("SELECT MIN(start_date), MAX(end_date) FROM tasks WHERE task_type != 'resolution'").fetchone()
+
+def _package_dates(conn):
+    conn.execute('''
+        SELECT (SELECT MIN(start_date) FROM tasks WHERE task_type != 'resolution'),
+               (SELECT MAX(end_date) FROM tasks WHERE task_type != 'resolution')
+    ''').fetchone()
+
+def _legacy_delete(conn, task_id):
+    conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+    conn.execute('DELETE FROM daily_logs WHERE task_id = ?', (task_id,))
+
+def _cascade_delete(conn, task_id):
+    conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--logs", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=200, help="calls timed per operation")
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "bench.db")
+        t0 = time.perf_counter()
+        daily_ids = build_legacy_db(path, args.tasks, args.logs)
+        print(f"built {args.tasks:,} tasks / {args.logs:,} logs in {time.perf_counter() - t0:.1f}s")
+
+        picks = [rng.choice(daily_ids) for _ in range(args.repeat)]
+        toggles = [(t, str(s + timedelta(days=rng.randrange(n)))) for t, s, n in picks]
+        maps = [(t,) for t, _, _ in picks]
+        once = [()] * max(1, args.repeat // 20)
+        victims = rng.sample(range(1, args.tasks + 1), 2 * args.repeat)
+        cases = [
+            ("toggle_daily_status (lookup+write)", _legacy_toggle, _upsert_toggle, toggles),
+            ("get_daily_status_map", _status_map, _status_map, maps),
+            ("get_resolutions_df (query)", _resolutions, _resolutions, once),
+            ("get_package_dates", _legacy_package_dates, _package_dates, once),
+        ]
+
+        conn = sqlite3.connect(path)
+        before = {name: _time(conn, old, a) for name, old, _, a in cases}
+        before["delete_task"] = _time(conn, _legacy_delete, [(v,) for v in victims[:args.repeat]])
+        conn.close()
+
+        # Up to the indexes and the counter triggers only: later schemas fold daily_logs into bitmaps
+        t0 = time.perf_counter()
+        conn = sqlite3.connect(path)
+        db.migrate(conn, target=LOGS_SCHEMA)
+        conn.close()
+        print(f"migrated to schema v{LOGS_SCHEMA} in {time.perf_counter() - t0:.1f}s\n")
+
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        after = {name: _time(conn, new, a) for name, _, new, a in cases}
+        after["delete_task"] = _time(conn, _cascade_delete, [(v,) for v in victims[args.repeat:]])
+        conn.close()
+
+    print(f"{'operation':<36}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name in before:
+        print(f"{name:<36}{before[name]:>12.3f}{after[name]:>12.3f}{before[name] / after[name]:>9.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: data behind the sidebar's "Active Tasks Status" list as the number
+of active tasks grows: rows for every active task vs. one LIMIT/OFFSET page
+(both sorted in SQL by get_task_page). The page is also the number of
+expanders/sliders the rerun renders.
+
+Usage:  python benchmarks/bench_paging.py [--active 100 1000 10000] [--page-size 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import builders
+import database as db
+
+def _seed(n_active):
+    today = date.today()
+    rows = [{"name": f"Task {i}", "priority": ("High", "Medium", "Low")[i % 3], "progress": i % 101,
+             "start_date": str(today), "end_date": str(today + timedelta(days=7))} for i in range(n_active)]
+    db.import_tasks(rows).result()
+
+def _best_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        db.read_cache.invalidate()
+        start = time.perf_counter()
+        rows = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--active", type=int, nargs="+", default=[100, 1000, 10_000])
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+
+    today = date.today()
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'active':>8}{'all rows ms':>13}{'widgets':>9}{'one page ms':>13}{'last page ms':>14}{'widgets':>9}")
+        for n in args.active:
+            db.DB_FILE = os.path.join(workdir, f"paging_{n}.db")
+            db.init_db()
+            _seed(n)
+            full = _best_ms(lambda: builders.active_record_rows(db.get_task_page("regular", n, 0, active_on=today).records))
+            first = _best_ms(lambda: builders.active_record_rows(
+                db.get_task_page("regular", args.page_size, 0, active_on=today).records))
+            last_offset = builders.page_bounds(n, args.page_size, n)[0]
+            last = _best_ms(lambda: builders.active_record_rows(
+                db.get_task_page("regular", args.page_size, last_offset, active_on=today).records))
+            print(f"{n:>8}{full[0]:>13.1f}{full[1]:>9}{first[0]:>13.2f}{last[0]:>14.2f}{first[1]:>9}")
+        db.flush_writes()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark: ops/sec of each public database.py function with a fresh
+connection per call and writes committed on the calling thread (the old
+behaviour) vs. the pooled connection layer and the write queue.
+
+Usage:  python benchmarks/bench_pool.py [--seconds 1.0]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+
+@contextmanager
+def _fresh_connect():
+    conn = sqlite3.connect(db.DB_FILE)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def _direct_submit(fn, *args):
+    """Runs a write op on its own connection and commits it before returning, like the pre-queue code."""
+    future = Future()
+    with _fresh_connect() as conn:
+        future.set_result(fn(conn, *args))
+    return future
+
+def _seed(n_tasks=200):
+    today = date.today()
+    for i in range(n_tasks):
+        db.add_task_to_db(f"Task {i}", "seed", "Medium", today, today + timedelta(days=6), "regular", i % 2 == 0)
+    db.add_task_to_db("Resolution", "seed", "High", date(today.year, 1, 1), date(today.year, 12, 31), "resolution", False)
+
+def _cases():
+    today = date.today()
+    day = str(today)
+    flip = [False]
+
+    def toggle():
+        flip[0] = not flip[0]
+        db.toggle_daily_status(1, day, flip[0]).result()
+
+    return [
+        ("init_db", db.init_db),
+        ("get_package_dates", db.get_package_dates),
+        ("update_task_progress", lambda: db.update_task_progress(2, 50).result()),
+        ("toggle_daily_status", toggle),
+        ("get_daily_status_map", lambda: db.get_daily_status_map(1)),
+        ("delete_task", lambda: db.delete_task(10 ** 9).result()),
+        ("get_tasks_df", db.get_tasks_df),
+        ("get_resolutions_df", db.get_resolutions_df),
+        # Last: it grows the table the read benchmarks above depend on
+        ("add_task_to_db", lambda: db.add_task_to_db("tmp", "", "Low", today, today, "regular", False).result()),
+    ]
+
+def _ops_per_sec(fn, seconds):
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        fn()
+        n += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return n / (now - start)
+
+def _run(label, connect, submit, seconds, workdir):
+    db.DB_FILE = os.path.join(workdir, f"{label}.db")
+    db._connect, db._submit = connect, submit
+    db.init_db()
+    _seed()
+    db.flush_writes()
+    results = {}
+    for name, fn in _cases():
+        fn()    # warm-up: the first DataFrame read also pays for importing pandas
+        results[name] = _ops_per_sec(fn, seconds)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="time budget per function")
+    args = parser.parse_args()
+
+    pooled = db._connect, db._submit
+    db.read_cache.size = 0  # measure the connection layer, not the read cache
+    with tempfile.TemporaryDirectory() as workdir:
+        before = _run("before", _fresh_connect, _direct_submit, args.seconds, workdir)
+        after = _run("after", *pooled, args.seconds, workdir)
+        db.get_pool().close()
+
+    print(f"{'function':<24}{'before ops/s':>14}{'after ops/s':>14}{'speedup':>10}")
+    for name in before:
+        print(f"{name:<24}{before[name]:>14,.0f}{after[name]:>14,.0f}{after[name] / before[name]:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
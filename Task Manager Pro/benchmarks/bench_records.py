@@ -0,0 +1,79 @@
+"""
+Benchmark: memory and time of reading every task as a pandas DataFrame
+(get_tasks_df) vs. compact TaskRecord tuples (get_task_records) vs. streaming
+them (iter_task_records).
+
+Usage:  python benchmarks/bench_records.py [--tasks 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+from synth import generate_db
+
+def deep_size(result):
+    """Bytes retained by a result: pandas' own deep count, or every distinct object in the records."""
+    if hasattr(result, "memory_usage"):
+        return int(result.memory_usage(deep=True).sum())
+    if not isinstance(result, list):
+        return 0
+    seen = set()
+    total = sys.getsizeof(result)
+    for record in result:
+        for obj in (record, *record):
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                total += sys.getsizeof(obj)
+    return total
+
+def _measure(fn):
+    """(seconds, traced peak bytes while running, bytes retained by the result)."""
+    db.read_cache.invalidate()
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    held = deep_size(result)
+    del result
+    gc.collect()
+    # Peak is taken on a second, traced run so tracing overhead doesn't skew the timing.
+    # Note: Arrow-backed pandas string buffers are allocated outside tracemalloc's view.
+    db.read_cache.invalidate()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, held
+
+def _stream():
+    # Typical hot-path consumer: one pass, nothing retained
+    return sum(r.progress for r in db.iter_task_records())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        generate_db(os.path.join(workdir, "records.db"), tasks=args.tasks, daily_density=0.0)
+        # Cache entries would otherwise keep the results alive
+        db.read_cache.size = 0
+        cases = [
+            ("get_tasks_df", db.get_tasks_df),
+            ("get_task_records", db.get_task_records),
+            ("iter_task_records (stream)", _stream),
+        ]
+        print(f"{'read path':<28}{'ms':>8}{'peak MB':>10}{'held MB':>10}{'bytes/task':>12}")
+        for name, fn in cases:
+            elapsed, peak, held = _measure(fn)
+            print(f"{name:<28}{elapsed * 1000:>8.0f}{peak / 2 ** 20:>10.1f}{held / 2 ** 20:>10.1f}{held / args.tasks:>12.0f}")
+        db.get_pool().close()
+
+if __name__ == "__main__":
+    main()
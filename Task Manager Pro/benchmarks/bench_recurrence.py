@@ -0,0 +1,96 @@
+"""
+Benchmark: storage and checklist reads for year-long habits with one
+daily_logs row per day (schema v6) vs. one completion bitmap per task
+(schema v7), measured on the same data before and after the migration.
+
+Usage:  python benchmarks/bench_recurrence.py [--habits 2000] [--completion 0.7]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+import recurrence
+
+LOGS_SCHEMA = 6     # last schema version with a daily_logs table
+
+def build_v6(path, n_habits, completion, seed=0):
+    """Year-long daily habits at schema v6, one daily_logs row per day."""
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=364)
+    conn = sqlite3.connect(path)
+    db.migrate(conn, target=LOGS_SCHEMA)
+    conn.executemany(
+        "INSERT INTO tasks (id, name, priority, start_date, end_date, task_type, is_daily, created_at) "
+        "VALUES (?, ?, 'Low', ?, ?, 'regular', 1, ?)",
+        [(i, f"Habit {i}", str(start), str(date.today()), str(start)) for i in range(1, n_habits + 1)])
+    conn.executemany(
+        "INSERT INTO daily_logs (task_id, log_date, is_complete) VALUES (?, ?, ?)",
+        ((i, str(start + timedelta(days=d)), int(rng.random() < completion))
+         for i in range(1, n_habits + 1) for d in range(365)))
+    conn.commit()
+    return conn
+
+def table_bytes(conn, *names):
+    """Bytes of pages held by the given tables and their indexes (dbstat)."""
+    conn.execute("VACUUM")
+    rows = conn.execute(f'''
+        SELECT SUM(pgsize) FROM dbstat
+        WHERE name IN ({", ".join("?" * len(names))})
+           OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name IN ({", ".join("?" * len(names))}))
+    ''', names + names).fetchone()
+    return rows[0] or 0
+
+def _best_us(fn, args_list, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / len(args_list) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--habits", type=int, default=2000)
+    parser.add_argument("--completion", type=float, default=0.7)
+    parser.add_argument("--reads", type=int, default=500)
+    args = parser.parse_args()
+    rng = random.Random(1)
+    today = date.today()
+    picks = [rng.randrange(1, args.habits + 1) for _ in range(args.reads)]
+    week = [(t, today - timedelta(days=6), today) for t in picks]
+    year = [(t, today - timedelta(days=364), today) for t in picks]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "habits.db")
+        conn = build_v6(path, args.habits, args.completion)
+        before = table_bytes(conn, "daily_logs")
+        sql = "SELECT log_date, is_complete FROM daily_logs WHERE task_id = ? AND log_date BETWEEN ? AND ?"
+        read_before = [_best_us(lambda t, lo, hi: conn.execute(sql, (t, str(lo), str(hi))).fetchall(), window)
+                       for window in (week, year)]
+
+        t0 = time.perf_counter()
+        db.migrate(conn)
+        migrated = time.perf_counter() - t0
+        after = table_bytes(conn, "task_completions")
+        # What get_daily_status_map does: one bitmap row, occurrences expanded for the window only
+        read_after = [_best_us(lambda t, lo, hi: recurrence.status_map(*next(db._recurring_tasks(conn, t))[1:], lo, hi),
+                               window) for window in (week, year)]
+        assert db._recompute_recurring(conn.cursor(), verify_only=True) == 0
+        conn.close()
+
+    print(f"{args.habits:,} year-long habits, migrated to v{db.SCHEMA_VERSION} in {migrated:.1f}s")
+    print(f"{'':<28}{'daily_logs':>12}{'bitmaps':>12}{'ratio':>9}")
+    print(f"{'bytes per habit':<28}{before / args.habits:>12.0f}{after / args.habits:>12.0f}{before / after:>8.0f}x")
+    for label, old, new in zip(("7-day checklist read (us)", "365-day checklist read (us)"), read_before, read_after):
+        print(f"{label:<28}{old:>12.0f}{new:>12.0f}{old / new:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
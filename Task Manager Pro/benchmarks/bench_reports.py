@@ -0,0 +1,71 @@
+"""
+Benchmark: exporting the Analytics report inline on the calling (Streamlit)
+thread vs. through reports.start_report(), which hands the rendering to a
+builder thread and worker processes and caches the result per data
+generation. "blocked ms" is how long the caller waits before it can draw
+the next frame; "ready ms" is when the file can be downloaded.
+
+Usage:  python benchmarks/bench_reports.py [--tasks 10000] [--years 2]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+import reports
+from synth import generate_db
+
+def inline_report():
+    """Every section rendered in this thread, as an export button would without the pool."""
+    sprints, tables = reports._read(reports.ReportJob("html", db.current_workspace(), None))
+    parts = [reports.render_efficiency(sprints), reports.render_status(sprints)] + [
+        reports.render_sprint_tables(tables[i:i + reports.SPRINTS_PER_SECTION])
+        for i in range(0, len(tables), reports.SPRINTS_PER_SECTION)
+    ]
+    return sum(map(len, parts))
+
+def pooled_report():
+    start = time.perf_counter()
+    job = reports.start_report("html")
+    blocked = time.perf_counter() - start
+    job.wait()
+    assert job.error is None, job.error
+    return blocked * 1000, (time.perf_counter() - start) * 1000
+
+def _touch():
+    """A committed write, so the next export can't reuse the cached report."""
+    db.update_task_progress(1, 50)
+    db.flush_writes()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        generate_db(os.path.join(workdir, "reports.db"), tasks=args.tasks, years=args.years)
+        db.sprint_summary()     # warm the read cache for both paths
+        start = time.perf_counter()
+        inline_report()
+        inline_ms = (time.perf_counter() - start) * 1000
+
+        _touch()
+        cold = pooled_report()      # includes spawning the workers
+        _touch()
+        warm = pooled_report()
+        cached = pooled_report()    # nothing written since: the finished job is returned
+        reports.shutdown()
+        db.get_pool().close()
+
+    print(f"{args.tasks:,} tasks, {args.years * 52} sprints, {reports.REPORT_WORKERS} report worker(s)")
+    print(f"{'':<26}{'blocked ms':>12}{'ready ms':>12}")
+    print(f"{'inline':<26}{inline_ms:>12.0f}{inline_ms:>12.0f}")
+    for label, (blocked, ready) in (("pool, cold start", cold), ("pool, warm", warm), ("pool, cached repeat", cached)):
+        print(f"{label:<26}{blocked:>12.1f}{ready:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: FTS5 search (search_tasks) vs. the pandas way of loading every
+task and filtering with str.contains, on a large synthetic database.
+
+Queries are prefixes of the synthetic vocabulary, so each one matches about a
+tenth of all tasks: the worst case for ranking, since bm25 scores every hit.
+The pandas frame is loaded once up front, so its timing is the scan alone;
+in the app it would also pay for get_tasks_df on every cache miss.
+
+Usage:  python benchmarks/bench_search.py [--tasks 1000000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+from synth import NOUNS, VERBS, generate_db
+
+def _pandas_search(df, query, limit):
+    text = df['name'].str.cat(df['description'].fillna(""), sep=" ")
+    hit = text.str.contains(query, case=False, regex=False)
+    return df[hit].head(limit)
+
+def _time(fn, queries):
+    samples = []
+    for q in queries:
+        db.read_cache.invalidate()
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    queries = [rng.choice(NOUNS + VERBS).lower()[:rng.randrange(3, 6)] for _ in range(args.repeat)]
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        generate_db(os.path.join(workdir, "search.db"), tasks=args.tasks, daily_density=0.0)
+        print(f"built {args.tasks:,} tasks (with FTS index) in {time.perf_counter() - start:.1f}s")
+        df = db.get_tasks_df()
+
+        cases = [
+            ("search_tasks (FTS5)", lambda q: db.search_tasks(q, limit=args.limit)),
+            ("search_tasks, page 50", lambda q: db.search_tasks(q, limit=args.limit, offset=49 * args.limit)),
+            ("search_tasks + priority", lambda q: db.search_tasks(q, limit=args.limit, priority="High")),
+            ("pandas str.contains", lambda q: _pandas_search(df, q, args.limit)),
+        ]
+        print(f"{'search':<26}{'p50 ms':>10}{'max ms':>10}")
+        for name, fn in cases:
+            p50, worst = _time(fn, queries)
+            print(f"{name:<26}{p50:>10.2f}{worst:>10.2f}")
+        db.get_pool().close()
+
+if __name__ == "__main__":
+    main()
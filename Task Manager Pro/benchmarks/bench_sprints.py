@@ -0,0 +1,90 @@
+"""
+Benchmark: Analytics sprint grouping in pandas (load every task, groupby
+end_date, keep each group) vs. a SQL GROUP BY over tasks vs. the
+sprints table that sprint_summary() now reads.
+
+Usage:  python benchmarks/bench_sprints.py [--sizes 10000 100000] [--tasks-per-sprint 20]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+
+def _seed(n_tasks, per_sprint, seed=0):
+    rng = random.Random(seed)
+    origin = date.today() - timedelta(days=7 * (n_tasks // per_sprint))
+    rows = []
+    for i in range(n_tasks):
+        end = origin + timedelta(days=7 * (i // per_sprint))
+        rows.append((f"Task {i}", "", "Medium", str(end - timedelta(days=6)), str(end),
+                     rng.randrange(101), "regular", 0, str(end)))
+    db._submit(db._executemany, '''
+        INSERT INTO tasks (name, description, priority, start_date, end_date, progress, task_type, is_daily, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows).result()
+
+def legacy_sprints():
+    df = db.get_tasks_df()
+    reg_df = df[df['task_type'] != 'resolution'].copy()
+    reg_df['end_date'] = pd.to_datetime(reg_df['end_date'])
+    sprint_data = []
+    for i, (end_dt, group) in enumerate(sorted(reg_df.groupby('end_date'))):
+        sprint_data.append({
+            "Sprint": f"Sprint {i + 1}",
+            "End Date": end_dt.strftime("%Y-%m-%d"),
+            "Efficiency": int(group['progress'].mean()),
+            "Tasks": len(group),
+            "Data": group,
+        })
+    return pd.DataFrame(sprint_data)
+
+def group_by_sprints():
+    """The aggregate sprint_summary() ran before the sprints table existed."""
+    with db._connect() as conn:
+        return pd.read_sql_query('''
+            SELECT ROW_NUMBER() OVER (ORDER BY end_date) AS sprint, end_date,
+                   CAST(AVG(progress) AS INTEGER) AS efficiency, COUNT(*) AS tasks, SUM(progress = 100) AS completed
+            FROM tasks WHERE task_type != 'resolution'
+            GROUP BY end_date ORDER BY end_date
+        ''', conn)
+
+def _measure(fn):
+    db.read_cache.invalidate()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed * 1000, peak / 2 ** 20
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--tasks-per-sprint", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8}{'sprints':>9} | {'pandas ms':>10}{'peak MB':>9} | {'GROUP BY ms':>12} | {'table ms':>9}{'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            db.DB_FILE = os.path.join(workdir, f"sprints_{n}.db")
+            db.init_db()
+            _seed(n, args.tasks_per_sprint)
+            old, old_ms, old_mb = _measure(legacy_sprints)
+            grouped, grouped_ms, _ = _measure(group_by_sprints)
+            new, new_ms, new_mb = _measure(db.sprint_summary)
+            assert old['Efficiency'].tolist() == grouped['efficiency'].tolist() == new['efficiency'].tolist()
+            print(f"{n:>8,}{len(new):>9,} | {old_ms:>10.0f}{old_mb:>9.1f} | {grouped_ms:>12.1f} | {new_ms:>9.1f}{new_mb:>9.2f}")
+        db.get_pool().close()
+
+if __name__ == "__main__":
+    main()
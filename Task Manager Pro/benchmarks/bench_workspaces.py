@@ -0,0 +1,62 @@
+"""
+Benchmark: one user's dashboard reads when the whole team shares a single
+database file vs. when every user has their own workspace file.
+
+Usage:  python benchmarks/bench_workspaces.py [--users 1 10 50] [--tasks-per-user 2000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+from synth import synthetic_tasks
+
+def user_reads(workspace):
+    """The database side of one uncached Calendar Dashboard + Analytics rerun."""
+    db.read_cache.invalidate()
+    db.get_events_in_range(date.today(), workspace=workspace)
+    db.get_tasks_df(workspace=workspace)
+    db.sprint_summary(workspace=workspace)
+    db.get_task_records("resolution", workspace=workspace)
+
+def _best_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--tasks-per-user", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db.WORKSPACE_DIR = workdir
+        print(f"{'users':>6}{'shared file ms':>16}{'own workspace ms':>18}")
+        created = 0
+        for n_users in args.users:
+            # Shared: everyone's rows in one file
+            db.DB_FILE = os.path.join(workdir, f"shared_{n_users}.db")
+            db.init_db()
+            db.import_tasks(synthetic_tasks(tasks=n_users * args.tasks_per_user, daily_density=0.0)).result()
+            shared = _best_ms(lambda: user_reads(None))
+            # Workspaces: only this user's rows behind their file, however many others exist
+            while created < n_users:
+                ws = f"user-{created}"
+                db.init_db(workspace=ws)
+                db.import_tasks(synthetic_tasks(tasks=args.tasks_per_user, daily_density=0.0, seed=created),
+                                workspace=ws).result()
+                created += 1
+            own = _best_ms(lambda: user_reads("user-0"))
+            print(f"{n_users:>6}{shared:>16.1f}{own:>18.1f}")
+        db.flush_writes()
+
+if __name__ == "__main__":
+    main()
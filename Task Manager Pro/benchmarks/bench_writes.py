@@ -0,0 +1,117 @@
+"""
+Benchmark: write throughput with N concurrent simulated sessions, each doing
+a stream of checkbox/slider writes followed by a read of what it just wrote.
+
+  direct     every session commits on its own connection (the pre-queue path)
+  queued     writes go through the writer thread; each session waits for its
+             write's future before reading
+  pipelined  writes go through the writer thread; the read-your-writes wait
+             happens implicitly in the next read
+
+Usage:  python benchmarks/bench_writes.py [--sessions 1 4 16] [--ops 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+from synth import generate_db
+
+def _direct_write(conn, task_id, day, checked):
+    # The same operation the writer runs, committed on the session's own connection
+    with conn:
+        db._set_statuses(conn, task_id, [(date.fromisoformat(day), checked)])
+    db.read_cache.invalidate()
+
+def _session(mode, session_no, n_ops, task_ids, latencies, errors):
+    """One user ticking their own daily tasks; asserts every read sees the write before it."""
+    rng = random.Random(session_no)
+    db.use_session(f"bench-{session_no}")
+    conn = db._open_connection(db.DB_FILE) if mode == "direct" else None
+    start_day = date.today() - timedelta(days=30)
+    try:
+        for _ in range(n_ops):
+            task_id = rng.choice(task_ids)
+            day = str(start_day + timedelta(days=rng.randrange(30)))
+            checked = rng.random() < 0.5
+            start = time.perf_counter()
+            try:
+                if mode == "direct":
+                    _direct_write(conn, task_id, day, checked)
+                else:
+                    future = db.toggle_daily_status(task_id, day, checked)
+                    if mode == "queued":
+                        future.result()
+            except sqlite3.OperationalError:
+                errors.append(1)
+                continue
+            # The rerun that follows the click reads the task's checklist back
+            assert db.get_daily_status_map(task_id).get(day) == checked
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        if conn is not None:
+            conn.close()
+
+def run(mode, n_sessions, n_ops, task_ids):
+    latencies, errors = [], []
+    # Each session owns a slice of the tasks, as separate users would
+    threads = [threading.Thread(target=_session, args=(mode, i, n_ops, task_ids[i::n_sessions], latencies, errors))
+               for i in range(n_sessions)]
+    writer = db.get_writer()
+    before = writer.stats()
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    after = writer.stats()
+    commits = after["batches"] - before["batches"]
+    per_commit = (after["ops"] - before["ops"]) / commits if commits else 1.0
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "ops_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))],
+        "locked": len(errors),
+        "ops_per_commit": per_commit,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--ops", type=int, default=200, help="writes per session")
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--habits", type=int, default=64, help="daily tasks shared out between sessions")
+    args = parser.parse_args()
+    if args.habits < max(args.sessions):
+        parser.error("--habits must be at least the largest --sessions")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        generate_db(os.path.join(workdir, "writes.db"), tasks=args.tasks, daily_density=0.0)
+        today = date.today()
+        tasks = [{"name": f"Habit {i}", "priority": "Low", "is_daily": 1,
+                  "start_date": str(today - timedelta(days=30)), "end_date": str(today)} for i in range(args.habits)]
+        db.import_tasks(tasks).result()
+        task_ids = [r.id for r in db.get_task_records("regular") if r.is_daily]
+
+        print(f"{'mode':<11}{'sessions':>9}{'ops/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'locked':>8}{'ops/commit':>12}")
+        for n in args.sessions:
+            for mode in ("direct", "queued", "pipelined"):
+                r = run(mode, n, args.ops, task_ids)
+                print(f"{mode:<11}{n:>9}{r['ops_per_s']:>10.0f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+                      f"{r['locked']:>8}{r['ops_per_commit']:>12.1f}")
+        assert db.recompute_all_progress(verify_only=True) == 0
+        db.flush_writes()
+        db.get_pool().close()
+
+if __name__ == "__main__":
+    main()
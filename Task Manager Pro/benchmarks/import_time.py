@@ -0,0 +1,84 @@
+"""
+Cold-start report: import cost of what app.py loads up front vs. per page,
+measured in fresh interpreters with `python -X importtime`, plus the cost of
+the same imports on a rerun (already in sys.modules).
+
+Usage:  python benchmarks/import_time.py [--repeat 3] [--top 10]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each part of app.py imports (see the top of app.py and each page branch)
+GROUPS = [
+    ("app.py top level", ["streamlit", "database", "profiling"]),
+    ("Calendar Dashboard", ["streamlit_calendar", "builders"]),
+    ("Analytics", ["builders", "reports", "plotly.express", "plotly.graph_objects"]),
+]
+
+_PROBE = """
+import json, sys, time
+mods = sys.argv[1:]
+t = time.perf_counter()
+for m in mods:
+    __import__(m)
+first = time.perf_counter() - t
+t = time.perf_counter()
+for m in mods:
+    __import__(m)
+again = time.perf_counter() - t
+print(json.dumps({"first_ms": first * 1000, "rerun_ms": again * 1000}))
+"""
+
+def _probe(preloaded, modules):
+    """Imports preloaded untimed, then times modules; returns (timings, importtime rows)."""
+    code = "".join(f"import {m}\n" for m in preloaded) + _PROBE
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code, *modules],
+                          cwd=APP_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None, []
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((name, int(self_us), int(cumulative_us)))
+    return json.loads(proc.stdout.strip().splitlines()[-1]), rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per group (best is kept)")
+    parser.add_argument("--top", type=int, default=10, help="heaviest modules listed per group")
+    args = parser.parse_args()
+
+    preloaded = []
+    seen = set()
+    print(f"{'group':<24}{'cold ms':>10}{'rerun ms':>10}")
+    details = []
+    for label, modules in GROUPS:
+        runs = [_probe(preloaded, modules) for _ in range(args.repeat)]
+        runs = [r for r in runs if r[0] is not None]
+        if not runs:
+            print(f"{label:<24}{'not installed':>20}")
+            continue
+        timings, rows = min(runs, key=lambda r: r[0]["first_ms"])
+        print(f"{label:<24}{timings['first_ms']:>10.1f}{timings['rerun_ms']:>10.3f}")
+        # -X importtime also logs the preloaded modules; keep only what this group added
+        rows = [r for r in rows if r[0].strip() not in seen]
+        seen.update(r[0].strip() for r in rows)
+        details.append((label, rows))
+        # Later pages are measured on top of what startup already imported
+        if not preloaded:
+            preloaded = modules
+
+    for label, rows in details:
+        print(f"\n{label}: heaviest imports by self time")
+        for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+            print(f"  {name.strip():<40}{self_us / 1000:>8.1f} ms self{cumulative_us / 1000:>9.1f} ms cumulative")
+
+if __name__ == "__main__":
+    main()
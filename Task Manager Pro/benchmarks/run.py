@@ -0,0 +1,194 @@
+"""
+Benchmark suite: times every database.py function and the data-preparation
+stages of both pages (no browser) on a synthetic database, reporting
+p50/p95/p99 latency and peak traced memory per case.
+
+Usage:
+    python benchmarks/run.py --tasks 20000 --daily-density 0.1 --resolutions 10 --years 3
+    python benchmarks/run.py --json results.json
+    python benchmarks/run.py --compare baseline.json [--threshold 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import builders
+import database as db
+from synth import NOUNS, generate_db, synthetic_tasks
+
+def build_cases(task_rows, workdir):
+    """(name, fn) pairs. Each fn is self-contained so it can be called repeatedly."""
+    rng = random.Random(42)
+    today = date.today()
+    regular = [t for t in task_rows if t["task_type"] == "regular"]
+    daily = [t for t in regular if t["is_daily"]] or regular
+    months = builders.window_months(today)
+    window_df = builders.merge_months([db.get_events_in_range(*m) for m in months])
+    sprints = db.sprint_summary()
+    latest_sprint = sprints['end_date'].iloc[-1] if not sprints.empty else str(today)
+    added = []
+
+    def daily_pick():
+        t = rng.choice(daily)
+        start = date.fromisoformat(t["start_date"])
+        span = (date.fromisoformat(t["end_date"]) - start).days + 1
+        return t["id"], start, span
+
+    def toggle():
+        task_id, start, span = daily_pick()
+        db.toggle_daily_status(task_id, str(start + timedelta(days=rng.randrange(span))), rng.random() < 0.5).result()
+
+    def set_week():
+        task_id, start, span = daily_pick()
+        db.set_daily_statuses(task_id, {str(start + timedelta(days=d)): True for d in range(min(7, span))}).result()
+
+    def add():
+        added.append(db.add_task_to_db("Bench task", "", "Low", today, today, "regular", False).result())
+
+    def delete():
+        if added:
+            db.delete_task(added.pop()).result()
+
+    def analytics_prep():
+        builders.sprint_frame(db.sprint_summary()).tail(7)
+
+    export_path = os.path.join(workdir, "export.csv")
+    return [
+        # --- database.py ---
+        ("db.init_db", db.init_db),
+        ("db.get_package_dates", db.get_package_dates),
+        ("db.get_tasks_df", db.get_tasks_df),
+        ("db.get_resolutions_df", db.get_resolutions_df),
+        ("db.get_daily_status_map", lambda: db.get_daily_status_map(daily_pick()[0])),
+        ("db.get_events_in_range(month)", lambda: db.get_events_in_range(*months[1])),
+        ("db.get_events_in_range(active)", lambda: db.get_events_in_range(today)),
+        ("db.get_task_page(active)", lambda: db.get_task_page("regular", 10, 0, active_on=today)),
+        ("db.has_regular_tasks", db.has_regular_tasks),
+        ("db.sprint_summary", db.sprint_summary),
+        ("db.get_sprint_tasks", lambda: db.get_sprint_tasks(latest_sprint)),
+        ("db.get_daily_stats(year)", lambda: db.get_daily_stats(today - timedelta(days=371), today)),
+        ("db.get_streaks", db.get_streaks),
+        ("db.search_tasks", lambda: db.search_tasks(rng.choice(NOUNS), limit=11)),
+        ("db.update_task_progress", lambda: db.update_task_progress(rng.choice(regular)["id"], rng.randrange(101)).result()),
+        ("db.toggle_daily_status", toggle),
+        ("db.set_daily_statuses(7 days)", set_week),
+        ("db.add_task_to_db", add),
+        ("db.delete_task", delete),
+        ("db.recompute_all_progress(verify)", lambda: db.recompute_all_progress(verify_only=True)),
+        ("db.export_tasks(csv)", lambda: db.export_tasks(export_path)),
+        # --- page data preparation ---
+        ("dashboard.merge_months", lambda: builders.merge_months([db.get_events_in_range(*m) for m in months])),
+        ("dashboard.build_events", lambda: builders.build_events(window_df)),
+        ("dashboard.active_task_rows", lambda: builders.active_record_rows(
+            db.get_task_page("regular", 10, 0, active_on=today).records)),
+        ("dashboard.resolution_rows", lambda: builders.resolution_rows(db.get_task_records("resolution"))),
+        ("analytics.sprint_prep", analytics_prep),
+        ("analytics.heatmap_grid", lambda: builders.heatmap_grid(db.get_daily_stats(today - timedelta(days=371), today), today)),
+    ]
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def measure(fn, repeat, warm):
+    samples = []
+    for _ in range(repeat):
+        if not warm:
+            db.read_cache.invalidate()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    if not warm:
+        db.read_cache.invalidate()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    ordered = sorted(samples)
+    return {
+        "calls": repeat,
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": _percentile(ordered, 0.50),
+        "p95_ms": _percentile(ordered, 0.95),
+        "p99_ms": _percentile(ordered, 0.99),
+        "peak_kb": peak / 1024,
+    }
+
+def compare(results, baseline_path, threshold):
+    """Prints p50 ratios against a previous --json run; returns the regressed case names."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressed = []
+    print(f"\n{'case':<36}{'base p50':>10}{'now p50':>10}{'ratio':>8}")
+    for name, now in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]["p50_ms"]
+        ratio = now["p50_ms"] / base if base else float("inf")
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        if flag:
+            regressed.append(name)
+        print(f"{name:<36}{base:>10.3f}{now['p50_ms']:>10.3f}{ratio:>7.2f}x{flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--daily-density", type=float, default=0.1, help="fraction of tasks that are daily checklists")
+    parser.add_argument("--resolutions", type=int, default=10)
+    parser.add_argument("--years", type=int, default=3, help="years of weekly sprints")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=30, help="timed calls per case")
+    parser.add_argument("--warm", action="store_true", help="keep the read cache between calls")
+    parser.add_argument("--only", help="run cases whose name contains this substring")
+    parser.add_argument("--json", help="write machine-readable results to this path")
+    parser.add_argument("--compare", help="previous --json output to compare p50s against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p50 slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    sizes = dict(tasks=args.tasks, daily_density=args.daily_density, resolutions=args.resolutions,
+                 years=args.years, seed=args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        n_tasks, n_logs = generate_db(os.path.join(workdir, "bench.db"), **sizes)
+        print(f"synthetic db: {n_tasks:,} tasks, {n_logs:,} logs ({time.perf_counter() - start:.1f}s)\n")
+        # Same seed, so these are exactly the rows generate_db inserted
+        cases = build_cases(synthetic_tasks(**sizes), workdir)
+
+        print(f"{'case':<36}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak KB':>10}")
+        for name, fn in cases:
+            if args.only and args.only not in name:
+                continue
+            results[name] = r = measure(fn, args.repeat, args.warm)
+            print(f"{name:<36}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}{r['p99_ms']:>9.3f}{r['peak_kb']:>10.0f}")
+        db.get_pool().close()
+
+    report = {
+        "config": dict(sizes, repeat=args.repeat, warm=args.warm, tasks_created=n_tasks, logs_created=n_logs),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.json}")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Synthetic task databases for the benchmarks.
+
+Tasks are grouped into weekly sprints spread over the requested years of
+history (ending in the current week), a fraction of them are daily-checklist
+tasks with one log row per day, and a few are resolutions.
+"""
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+
+PRIORITIES = ("High", "Medium", "Low")
+# Small vocabulary so full-text search has realistic, overlapping hits
+VERBS = ("Write", "Review", "Plan", "Fix", "Call", "Draft", "Clean", "Prepare", "Update", "Read")
+NOUNS = ("report", "budget", "garden", "invoice", "slides", "kitchen", "roadmap", "essay", "backlog", "taxes")
+
+def synthetic_tasks(tasks=10_000, daily_density=0.1, resolutions=5, years=2, seed=0):
+    """Task dict rows with explicit ids, oldest sprint first."""
+    rng = random.Random(seed)
+    today = date.today()
+    last_sprint_end = today + timedelta(days=6 - today.weekday())
+    n_sprints = max(1, years * 52)
+    rows = []
+    for i in range(1, tasks + 1):
+        sprint = (i - 1) * n_sprints // tasks
+        end = last_sprint_end - timedelta(days=7 * (n_sprints - 1 - sprint))
+        start = end - timedelta(days=rng.randrange(7))
+        daily = rng.random() < daily_density
+        rows.append({
+            "id": i, "name": f"{rng.choice(VERBS)} {rng.choice(NOUNS)} {i}",
+            "description": "" if i % 3 else f"Notes on the {rng.choice(NOUNS)} for task {i}",
+            "priority": rng.choice(PRIORITIES), "start_date": str(start), "end_date": str(end),
+            "progress": 0 if daily else rng.choice((0, 25, 50, 75, 100, 100)),
+            "task_type": "regular", "is_daily": int(daily), "created_at": str(start),
+        })
+    for j in range(resolutions):
+        year = today.year - j % max(1, years)
+        rows.append({
+            "id": tasks + j + 1, "name": f"Resolution {j + 1}", "description": "Long-term goal",
+            "priority": "High", "start_date": f"{year}-01-01", "end_date": f"{year}-12-31",
+            "progress": rng.randrange(101), "task_type": "resolution", "is_daily": 0,
+            "created_at": f"{year}-01-01",
+        })
+    return rows
+
+def synthetic_logs(task_rows, completion=0.7, seed=0):
+    """Streams one daily log row (the import/export format) per day of every daily task's span."""
+    rng = random.Random(seed + 1)
+    for t in task_rows:
+        if not t["is_daily"]:
+            continue
+        start = date.fromisoformat(t["start_date"])
+        span = (date.fromisoformat(t["end_date"]) - start).days + 1
+        for offset in range(span):
+            yield {"task_id": t["id"], "log_date": str(start + timedelta(days=offset)),
+                   "is_complete": int(rng.random() < completion)}
+
+def generate_db(path, **sizes):
+    """Creates (or overwrites) a synthetic database at path and points database.py at it."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db.DB_FILE = path
+    db.init_db()
+    rows = synthetic_tasks(**sizes)
+    return db.import_tasks(rows, synthetic_logs(rows, seed=sizes.get("seed", 0))).result()
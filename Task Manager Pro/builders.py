@@ -0,0 +1,140 @@
+"""
+Column-wise builders that turn task DataFrames into what the UI renders.
+Kept free of Streamlit so they can be tested and benchmarked on their own.
+"""
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+
+PRIO_COLORS = {"High": "#FF4B4B", "Medium": "#FFAA00", "Low": "#00CC96"}
+DEFAULT_COLOR = "#3788d8"
+PRIORITY_EMOJI = {"High": "🔴", "Medium": "🟡"}
+DEFAULT_EMOJI = "🟢"
+
+# ==========================================
+# CALENDAR WINDOW
+# ==========================================
+
+def month_range(day):
+    """First and last day of the month containing day."""
+    first = day.replace(day=1)
+    next_first = (first + timedelta(days=32)).replace(day=1)
+    return first, next_first - timedelta(days=1)
+
+def window_months(day):
+    """
+    (first, last) of the month holding day and of the month either side, oldest
+    first. Reading them one month at a time keeps cache keys aligned to months,
+    so paging by a month reuses the two months already loaded.
+    """
+    first, last = month_range(day)
+    return [month_range(first - timedelta(days=1)), (first, last), month_range(last + timedelta(days=1))]
+
+def merge_months(frames):
+    """One tasks frame from per-month reads; a task spanning several months appears once."""
+    frames = [df for df in frames if not df.empty] or frames[:1]
+    return pd.concat(frames, ignore_index=True).drop_duplicates("id", ignore_index=True)
+
+def page_bounds(total, page_size, page):
+    """(offset, page, pages) for a 1-based page number, clamped to the pages that exist."""
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, page), pages)
+    return (page - 1) * page_size, page, pages
+
+# ==========================================
+# ROW BUILDERS
+# ==========================================
+
+def _iso(col):
+    return pd.to_datetime(col).dt.strftime("%Y-%m-%d")
+
+def _progress_label(df):
+    return df['name'].astype(str) + " (" + df['progress'].astype(str) + "%)"
+
+def build_events(df):
+    """streamlit_calendar event dicts for every row of a tasks frame."""
+    if df.empty:
+        return []
+    start = _iso(df['start_date'])
+    # FullCalendar treats the end date as exclusive
+    end_excl = (pd.to_datetime(df['end_date']) + pd.Timedelta(days=1)).dt.strftime("%Y-%m-%d")
+    end = _iso(df['end_date'])
+    colors = df['priority'].map(PRIO_COLORS).fillna(DEFAULT_COLOR)
+    titles = np.where(df['is_daily'].astype(bool), "☑ ", "") + _progress_label(df)
+
+    return [
+        {
+            "title": title,
+            "start": s,
+            "end": e_excl,
+            "backgroundColor": color,
+            "borderColor": color,
+            "extendedProps": {
+                "id": task_id,
+                "desc": desc,
+                "progress": progress,
+                "priority": priority,
+                "is_daily": is_daily,
+                "recurrence": rule,
+                "start": s,
+                "end": e,
+            },
+        }
+        for title, s, e_excl, e, color, task_id, desc, progress, priority, is_daily, rule in zip(
+            titles.tolist(), start.tolist(), end_excl.tolist(), end.tolist(), colors.tolist(),
+            df['id'].tolist(), df['description'].tolist(), df['progress'].tolist(),
+            df['priority'].tolist(), df['is_daily'].tolist(), df['recurrence'].tolist(),
+        )
+    ]
+
+def active_record_rows(records):
+    """Sidebar rows (id, label, description, end_date, progress) from get_task_page's sorted TaskRecords."""
+    return [
+        {"id": r.id, "label": f"{PRIORITY_EMOJI.get(r.priority, DEFAULT_EMOJI)} {r.name} ({r.progress}%)",
+         "description": r.description, "end_date": r.end_date, "progress": int(r.progress)}
+        for r in records
+    ]
+
+def resolution_rows(records):
+    """Sidebar rows (id, label, description, progress) from resolution TaskRecords."""
+    return [
+        {"id": r.id, "label": f"{r.name} ({r.progress}%)", "description": r.description, "progress": int(r.progress)}
+        for r in records
+    ]
+
+# ==========================================
+# SPRINTS
+# ==========================================
+
+def sprint_frame(summary):
+    """database.sprint_summary() with the display column names and a "Sprint N" label."""
+    df = summary.rename(columns={
+        "end_date": "End Date", "efficiency": "Efficiency", "tasks": "Tasks", "completed": "Completed"
+    })
+    df["Sprint"] = "Sprint " + df["sprint"].astype(str)
+    return df
+
+# ==========================================
+# HABIT HEATMAP
+# ==========================================
+
+def heatmap_grid(stats, end):
+    """
+    GitHub-style year grid from get_daily_stats(): 7 weekday rows (Monday first)
+    by 53 week columns, the last holding end. Cells are completed/total, or None
+    where nothing was due or the day is after end. Returns (z, hover, week_starts).
+    """
+    first = end - timedelta(days=end.weekday(), weeks=52)
+    week_starts = [first + timedelta(weeks=w) for w in range(53)]
+    z = [[None] * 53 for _ in range(7)]
+    hover = [[""] * 53 for _ in range(7)]
+    for w, monday in enumerate(week_starts):
+        for d in range(7):
+            day = monday + timedelta(days=d)
+            if day > end:
+                break
+            done, total = stats.get(str(day), (0, 0))
+            hover[d][w] = f"{day:%a %b %d, %Y}: {done}/{total} done"
+            if total:
+                z[d][w] = done / total
+    return z, hover, week_starts
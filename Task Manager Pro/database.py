@@ -1,11 +1,483 @@
 import sqlite3
-import pandas as pd
+import csv
+import json
+import os
+import re
+import threading
+import queue
+import functools
+import atexit
+from concurrent.futures import Future, wait as wait_futures
+from collections import Counter, OrderedDict, namedtuple
+from contextlib import contextmanager
+from itertools import islice
 from datetime import date, datetime
+from profiling import traced
+import recurrence
 
 DB_FILE = "task_tracker_v3.db"
 
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
+# Dates are stored as ISO text; this parses them once, inside the cursor. Tasks share
+# a handful of sprint dates, so the cache also makes records share date objects.
+sqlite3.register_converter("isodate", functools.lru_cache(maxsize=4096)(lambda raw: date.fromisoformat(raw.decode())))
+
+# ==========================================
+# WORKSPACES
+# ==========================================
+
+# Each workspace is its own database file, so one team's (or user's) reads
+# and writes never touch another's rows or lock. The default workspace is
+# DB_FILE itself; the others live in WORKSPACE_DIR/<slug>.db.
+DEFAULT_WORKSPACE = "default"
+WORKSPACE_DIR = "workspaces"
+MAX_OPEN_WORKSPACES = 8     # pools/writers kept open at once, least recently used closed first
+
+_SLUG = re.compile(r"[a-z0-9][a-z0-9_-]{0,63}")
+_scope = threading.local()
+
+def workspace_slug(name):
+    """Normalizes a display name into a workspace id: lowercase letters, digits, '-' and '_'."""
+    slug = re.sub(r"[^a-z0-9_-]+", "-", (name or "").strip().lower()).strip("-_")[:64]
+    return slug or DEFAULT_WORKSPACE
+
+def workspace_file(workspace=None):
+    """Database file behind a workspace (None means the current one)."""
+    workspace = workspace or current_workspace()
+    if workspace == DEFAULT_WORKSPACE:
+        return DB_FILE
+    if not _SLUG.fullmatch(workspace):
+        raise ValueError(f"Invalid workspace id: {workspace!r} (see workspace_slug)")
+    return os.path.join(WORKSPACE_DIR, f"{workspace}.db")
+
+def list_workspaces():
+    """The default workspace, then every other one that has a database file, by name."""
+    names = [f[:-3] for f in os.listdir(WORKSPACE_DIR) if f.endswith(".db")] if os.path.isdir(WORKSPACE_DIR) else []
+    return [DEFAULT_WORKSPACE] + sorted(n for n in names if _SLUG.fullmatch(n) and n != DEFAULT_WORKSPACE)
+
+def use_workspace(workspace):
+    """Binds the calling thread to a workspace; every call without workspace= then uses it."""
+    _scope.workspace = workspace
+
+def current_workspace():
+    return getattr(_scope, "workspace", None) or DEFAULT_WORKSPACE
+
+def scoped(fn):
+    """Adds a workspace= keyword to fn, overriding the thread's workspace for that call."""
+    @functools.wraps(fn)
+    def wrapper(*args, workspace=None, **kwargs):
+        if workspace is None:
+            return fn(*args, **kwargs)
+        previous = getattr(_scope, "workspace", None)
+        _scope.workspace = workspace
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _scope.workspace = previous
+    return wrapper
+
+# ==========================================
+# CONNECTION POOL
+# ==========================================
+
+POOL_SIZE = 4
+ACQUIRE_POLL = 0.25     # seconds between checks by a thread waiting for a connection
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",       # ~16 MB page cache
+    "PRAGMA mmap_size = 134217728",     # 128 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+)
+
+def _open_connection(db_file):
+    # PARSE_COLNAMES only converts columns aliased as "name [type]" (see TASK_RECORD_SQL)
+    conn = sqlite3.connect(db_file, check_same_thread=False, cached_statements=256,
+                           detect_types=sqlite3.PARSE_COLNAMES)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+class ConnectionPool:
+    """
+    Small thread-safe pool of long-lived SQLite connections.
+    Streamlit runs every session on its own thread, so connections are opened
+    with check_same_thread=False and handed out to one thread at a time.
+    Each connection keeps its own prepared-statement cache, so the constant
+    SQL strings below are compiled once per connection instead of once per call.
+    """
+
+    def __init__(self, db_file, size=POOL_SIZE):
+        self.db_file = db_file
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+
+    def _open(self):
+        return _open_connection(self.db_file)
+
+    def acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    # Evicted by get_pool: released connections are closed, not handed
+                    # back, so use a throwaway one (release() closes it too)
+                    return self._open()
+                if self._opened < self.size:
+                    self._opened += 1
+                    try:
+                        return self._open()
+                    except Exception:
+                        self._opened -= 1
+                        raise
+            try:
+                return self._idle.get(timeout=ACQUIRE_POLL)
+            except queue.Empty:
+                pass    # re-check: the pool may have been closed meanwhile
+
+    def release(self, conn):
+        if self._closed:
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._opened = 0
+
+_pools = OrderedDict()
+_pool_lock = threading.Lock()
+
+def get_pool(db_file=None):
+    """
+    Returns the pool for db_file (default: the current workspace's file).
+    At most MAX_OPEN_WORKSPACES pools stay open; the least recently used one
+    is closed (connections still borrowed from it close when released, and
+    threads waiting on it open their own).
+    """
+    db_file = db_file or workspace_file()
+    with _pool_lock:
+        pool = _pools.get(db_file)
+        if pool is None or pool._closed:
+            if db_file != DB_FILE:
+                os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+            pool = _pools[db_file] = ConnectionPool(db_file)
+        _pools.move_to_end(db_file)
+        while len(_pools) > MAX_OPEN_WORKSPACES:
+            _pools.popitem(last=False)[1].close()
+    return pool
+
+@contextmanager
+def _connect(db_file=None):
+    """
+    Borrows a pooled connection; commits on success and rolls back on error.
+    Waits first for this session's queued writes, so reads see them.
+    """
+    db_file = db_file or workspace_file()
+    _await_session_writes(db_file)
+    pool = get_pool(db_file)
+    conn = pool.acquire()
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.release(conn)
+
+# ==========================================
+# WRITE QUEUE
+# ==========================================
+
+WRITE_BATCH_SIZE = 64
+
+class WriteQueue:
+    """
+    Single background writer thread that owns the write connection.
+    Operations are fn(conn, *args) callables queued by submit(); whatever is
+    waiting when the writer wakes up (up to WRITE_BATCH_SIZE ops) is applied
+    in one transaction and committed once (group commit). Each op runs in its
+    own SAVEPOINT, so a failing op is rolled back alone and only its future
+    gets the exception. The read cache is invalidated after the commit and
+    before any future resolves.
+    """
+
+    def __init__(self, db_file, batch_size=WRITE_BATCH_SIZE):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.batches = 0
+        self.ops = 0
+        self._ops = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, session=None):
+        future = Future()
+        with self._lock:
+            self._pending.setdefault(session, set()).add(future)
+        future.add_done_callback(lambda f: self._forget(session, f))
+        self._ops.put((fn, args, future))
+        return future
+
+    def _forget(self, session, future):
+        with self._lock:
+            pending = self._pending.get(session)
+            if pending is not None:
+                pending.discard(future)
+                if not pending:
+                    del self._pending[session]
+
+    def wait_for(self, session):
+        """
+        Blocks until every write submitted for session has committed or failed.
+        Failures aren't raised here: they stay on each write's Future.
+        """
+        with self._lock:
+            pending = list(self._pending.get(session, ()))
+        if pending:
+            wait_futures(pending)
+
+    def _run(self):
+        conn = _open_connection(self.db_file)
+        try:
+            while True:
+                batch = [self._ops.get()]
+                while batch[-1] is not None and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._ops.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = batch[-1] is None
+                ops = [op for op in batch if op is not None]
+                if ops:
+                    self._commit(conn, ops)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _commit(self, conn, ops):
+        outcomes = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for fn, args, future in ops:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute('SAVEPOINT op')
+                try:
+                    result = fn(conn, *args)
+                except Exception as exc:
+                    conn.execute('ROLLBACK TO op')
+                    outcomes.append((future, None, exc))
+                else:
+                    outcomes.append((future, result, None))
+                conn.execute('RELEASE op')
+            conn.commit()
+        except Exception as exc:
+            # The transaction itself failed (lock timeout, disk full...): nothing was applied
+            if conn.in_transaction:
+                conn.rollback()
+            outcomes = [(f, None, exc) for _, _, f in ops if not f.done()]
+        self.batches += 1
+        self.ops += len(ops)
+        read_cache.invalidate(self.db_file)
+        for future, result, exc in outcomes:
+            if exc is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exc)
+
+    def close(self):
+        """Applies everything already queued, then stops the writer thread."""
+        self._ops.put(None)
+        self._thread.join()
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "ops": self.ops,
+            "ops_per_commit": self.ops / self.batches if self.batches else 0.0,
+            "queued": self._ops.qsize(),
+        }
+
+_writers = OrderedDict()
+_writer_lock = threading.Lock()
+_session = threading.local()
+
+def _writer_for(db_file):
+    # Caller holds _writer_lock. Evicted writers are flushed before anything
+    # else is queued, so no session can be left waiting on them.
+    writer = _writers.get(db_file)
+    if writer is None:
+        writer = _writers[db_file] = WriteQueue(db_file)
+    _writers.move_to_end(db_file)
+    while len(_writers) > MAX_OPEN_WORKSPACES:
+        _writers.popitem(last=False)[1].close()
+    return writer
+
+def get_writer(db_file=None):
+    """Returns the writer thread for db_file (default: the current workspace's file)."""
+    with _writer_lock:
+        return _writer_for(db_file or workspace_file())
+
+@atexit.register
+def flush_writes():
+    """Stops every writer once everything queued so far has been committed."""
+    with _writer_lock:
+        while _writers:
+            _writers.popitem()[1].close()
+
+def use_session(session_id):
+    """
+    Binds the calling thread to a session. Reads wait for that session's own
+    queued writes (read-your-writes); other sessions' writes never block them.
+    Unbound threads are their own session.
+    """
+    _session.id = session_id
+
+def _session_id():
+    return getattr(_session, "id", None) or threading.get_ident()
+
+def _submit(fn, *args):
+    """Queues fn(conn, *args) on the current workspace's writer; returns a Future of its result."""
+    db_file = workspace_file()
+    with _writer_lock:
+        return _writer_for(db_file).submit(fn, *args, session=_session_id())
+
+def _await_session_writes(db_file=None):
+    writer = _writers.get(db_file or workspace_file())
+    if writer is not None:
+        writer.wait_for(_session_id())
+
+def writer_stats():
+    writer = _writers.get(workspace_file())
+    return writer.stats() if writer is not None else None
+
+def _execute(conn, sql, params=()):
+    return conn.execute(sql, params).rowcount
+
+def _executemany(conn, sql, seq):
+    return conn.executemany(sql, seq).rowcount
+
+# ==========================================
+# READ CACHE
+# ==========================================
+
+CACHE_SIZE = 64
+
+class ReadCache:
+    """
+    Process-wide LRU for read results, keyed on a DB generation counter.
+    Every committed write bumps the generation, so entries from before the
+    write can never be served again; reruns that change nothing never reach SQLite.
+    Generations are kept per database file (scope), so a write in one
+    workspace leaves the others' entries alone; invalidate() with no scope
+    drops everything.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.generation = 0
+        self._scopes = {}
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def generation_of(self, scope):
+        return self.generation, self._scopes.get(scope, 0)
+
+    def put(self, key, value):
+        with self._lock:
+            # A write committed while this value was being read: don't keep it
+            if key[1] != self.generation_of(key[0]):
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope=None):
+        with self._lock:
+            if scope is None:
+                self.generation += 1
+                self._entries.clear()
+                return
+            self._scopes[scope] = self._scopes.get(scope, 0) + 1
+            for key in [k for k in self._entries if k[0] == scope]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "generation": self.generation,
+            }
+
+read_cache = ReadCache()
+
+def cached_read(fn):
+    """Caches fn(*args, **kwargs) per workspace and DB generation. Mutable results are copied on the way out."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        scope = workspace_file()
+        _await_session_writes(scope)
+        key = (scope, read_cache.generation_of(scope), fn.__name__, args, tuple(sorted(kwargs.items())))
+        hit, value = read_cache.get(key)
+        if not hit:
+            value = fn(*args, **kwargs)
+            read_cache.put(key, value)
+        return value.copy() if hasattr(value, "copy") else value
+    return wrapper
+
+def cache_stats():
+    return read_cache.stats()
+
+@scoped
+def data_generation():
+    """
+    The workspace's read-cache generation once this session's queued writes
+    have committed. It changes on every commit, so it can key derived results.
+    """
+    scope = workspace_file()
+    _await_session_writes(scope)
+    return read_cache.generation_of(scope)
+
+# ==========================================
+# SCHEMA & MIGRATIONS
+# ==========================================
+
+def create_base_schema(conn):
+    """Original (version 0) schema. Every later change is a numbered migration below."""
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS tasks (
@@ -30,19 +502,387 @@ def init_db():
             FOREIGN KEY(task_id) REFERENCES tasks(id)
         )
     ''')
+
+def _migration_1(c):
+    """Secondary indexes; UNIQUE(task_id, log_date) and ON DELETE CASCADE on daily_logs."""
+    c.execute('''
+        CREATE TABLE daily_logs_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            log_date DATE NOT NULL,
+            is_complete INTEGER DEFAULT 0,
+            UNIQUE(task_id, log_date),
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
+        )
+    ''')
+    # Keep the newest row per (task, day) and drop logs orphaned by old deletes
+    c.execute('''
+        INSERT INTO daily_logs_new (id, task_id, log_date, is_complete)
+        SELECT id, task_id, log_date, is_complete FROM daily_logs
+        WHERE id IN (SELECT MAX(id) FROM daily_logs GROUP BY task_id, log_date)
+          AND task_id IN (SELECT id FROM tasks)
+          AND log_date IS NOT NULL
+    ''')
+    c.execute('DROP TABLE daily_logs')
+    c.execute('ALTER TABLE daily_logs_new RENAME TO daily_logs')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_tasks_type ON tasks(task_type)')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_reg_start ON tasks(start_date) WHERE task_type != 'resolution'")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_reg_end ON tasks(end_date) WHERE task_type != 'resolution'")
+
+# Number of calendar days a task spans, and its progress for a given completed-day count
+_SPAN_SQL = "(CAST(julianday(end_date) - julianday(start_date) AS INTEGER) + 1)"
+_PROGRESS_SQL = f"CASE WHEN {_SPAN_SQL} > 0 THEN ({{done}}) * 100 / {_SPAN_SQL} ELSE progress END"
+
+def _progress_trigger(name, event, when, task_ref, delta):
+    return f'''
+        CREATE TRIGGER {name} AFTER {event} ON daily_logs WHEN {when}
+        BEGIN
+            UPDATE tasks SET
+                completed_days = completed_days + ({delta}),
+                progress = {_PROGRESS_SQL.format(done=f"completed_days + ({delta})")}
+            WHERE id = {task_ref}.task_id AND {task_ref}.log_date BETWEEN start_date AND end_date;
+        END
+    '''
+
+# Counts completed in-span days per daily task in one grouped pass
+_COMPLETED_COUNTS_SQL = '''
+    SELECT t.id AS task_id, COUNT(d.id) AS done
+    FROM tasks t
+    LEFT JOIN daily_logs d
+        ON d.task_id = t.id AND d.is_complete = 1 AND d.log_date BETWEEN t.start_date AND t.end_date
+    WHERE t.is_daily = 1
+    GROUP BY t.id
+'''
+
+def _recompute_progress(c):
+    c.execute(f'''
+        UPDATE tasks SET completed_days = c.done, progress = {_PROGRESS_SQL.format(done="c.done")}
+        FROM ({_COMPLETED_COUNTS_SQL}) AS c
+        WHERE tasks.id = c.task_id
+          AND (tasks.completed_days IS NOT c.done OR tasks.progress IS NOT {_PROGRESS_SQL.format(done="c.done")})
+    ''')
+    return c.rowcount
+
+def _migration_2(c):
+    """Stored completed-day counter on tasks, kept in step with daily_logs by triggers."""
+    c.execute('ALTER TABLE tasks ADD COLUMN completed_days INTEGER DEFAULT 0')
+    c.execute(_progress_trigger('trg_logs_insert', 'INSERT', 'NEW.is_complete = 1', 'NEW', '1'))
+    c.execute(_progress_trigger('trg_logs_delete', 'DELETE', 'OLD.is_complete = 1', 'OLD', '-1'))
+    c.execute(_progress_trigger(
+        'trg_logs_update', 'UPDATE OF is_complete', '(NEW.is_complete = 1) != (OLD.is_complete = 1)',
+        'NEW', 'CASE WHEN NEW.is_complete = 1 THEN 1 ELSE -1 END'))
+    _recompute_progress(c)
+
+def _migration_3(c):
+    """Covering end_date index so sprint aggregates never touch the table."""
+    c.execute('DROP INDEX IF EXISTS idx_tasks_reg_end')
+    c.execute("CREATE INDEX idx_tasks_reg_end ON tasks(end_date, progress, task_type) WHERE task_type != 'resolution'")
+
+def _migration_4(c):
+    """FTS5 index over tasks.name/description (external content), synced by triggers."""
+    c.execute('''
+        CREATE VIRTUAL TABLE tasks_fts USING fts5(
+            name, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    c.execute('''
+        CREATE TRIGGER trg_tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts(rowid, name, description) VALUES (NEW.id, NEW.name, NEW.description);
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER trg_tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, name, description) VALUES ('delete', OLD.id, OLD.name, OLD.description);
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER trg_tasks_fts_update AFTER UPDATE OF name, description ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, name, description) VALUES ('delete', OLD.id, OLD.name, OLD.description);
+            INSERT INTO tasks_fts(rowid, name, description) VALUES (NEW.id, NEW.name, NEW.description);
+        END
+    ''')
+    c.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+# daily_stats: per date, checklist occurrences due (total) and ticked (completed)
+# across all daily tasks. task_streaks: per daily task, its latest run of
+# consecutive ticked occurrences, its longest run, and the next occurrence
+# after the latest run (the day it must be ticked by to stay current). Both are
+# maintained by the write operations below (_insert_task, _set_statuses,
+# _delete_task) in the same transaction, and rebuilt from the completion
+# bitmaps by these helpers after bulk changes.
+
+def _recurring_tasks(c, task_id=None):
+    """(id, rule, start, end, bits) per daily task with a valid span, in id order; bits unpacked."""
+    where, params = ("", ()) if task_id is None else ("AND t.id = ?", (task_id,))
+    rows = c.execute(f'''
+        SELECT t.id, t.recurrence, t.start_date, t.end_date, b.bits
+        FROM tasks t LEFT JOIN task_completions b ON b.task_id = t.id
+        WHERE t.is_daily = 1 AND t.start_date <= t.end_date {where}
+        ORDER BY t.id
+    ''', params)
+    for task_id, rule, start, end, bits in rows:
+        yield task_id, rule, date.fromisoformat(start), date.fromisoformat(end), recurrence.unpack(bits)
+
+def _add_occurrence_totals(c, rule, start, end, delta):
+    c.executemany('''
+        INSERT INTO daily_stats (log_date, completed, total) VALUES (?, 0, ?)
+        ON CONFLICT(log_date) DO UPDATE SET total = total + excluded.total
+    ''', ((str(day), delta) for day in recurrence.occurrences(rule, start, end)))
+
+def _rebuild_daily_stats(c):
+    total, completed = Counter(), Counter()
+    for _, rule, start, end, bits in _recurring_tasks(c.connection.cursor()):
+        total.update(recurrence.occurrences(rule, start, end))
+        completed.update(recurrence.done_days(start, end, bits))
+    c.execute('DELETE FROM daily_stats')
+    c.executemany('INSERT INTO daily_stats (log_date, completed, total) VALUES (?, ?, ?)',
+                  ((str(day), completed[day], n) for day, n in total.items()))
+
+def _streak_row(task_id, rule, start, end, bits):
+    run = recurrence.latest_run(rule, start, end, bits)
+    if run is None:
+        return None
+    run_end, run_length, longest = run
+    return task_id, str(run_end), run_length, longest, str(recurrence.next_after(rule, start, run_end))
+
+_STREAK_UPSERT = '''
+    INSERT INTO task_streaks (task_id, run_end, run_length, longest, next_due) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(task_id) DO UPDATE SET run_end = excluded.run_end, run_length = excluded.run_length,
+                                       longest = excluded.longest, next_due = excluded.next_due
+'''
+
+def _store_counters(c, task_id, rule, start, end, bits):
+    c.execute('UPDATE tasks SET completed_days = ?, progress = COALESCE(?, progress) WHERE id = ?',
+              (recurrence.count_done(start, end, bits), recurrence.progress(rule, start, end, bits), task_id))
+
+def _store_streak(c, task_id, rule, start, end, bits):
+    row = _streak_row(task_id, rule, start, end, bits)
+    if row is None:
+        c.execute('DELETE FROM task_streaks WHERE task_id = ?', (task_id,))
+    else:
+        c.execute(_STREAK_UPSERT, row)
+
+def _refresh_streaks(c):
+    """Recomputes task_streaks for every daily task from its bitmap."""
+    rows = [_streak_row(*task) for task in _recurring_tasks(c.connection.cursor())]
+    c.execute('DELETE FROM task_streaks')
+    c.executemany(_STREAK_UPSERT, (row for row in rows if row))
+
+def _recompute_recurring(c, verify_only=False):
+    """
+    completed_days/progress of every daily task from its bitmap and rule.
+    Returns how many tasks were out of sync; fixes them unless verify_only.
+    """
+    stored = {row[0]: row[1:] for row in c.execute('SELECT id, completed_days, progress FROM tasks WHERE is_daily = 1')}
+    drifted = []
+    for task_id, rule, start, end, bits in _recurring_tasks(c.connection.cursor()):
+        done_count, progress = stored[task_id]
+        expected = (recurrence.count_done(start, end, bits), recurrence.progress(rule, start, end, bits))
+        if expected[1] is None:
+            expected = (expected[0], progress)
+        if (done_count, progress) != expected:
+            drifted.append((*expected, task_id))
+    if not verify_only:
+        c.executemany('UPDATE tasks SET completed_days = ?, progress = ? WHERE id = ?', drifted)
+    return len(drifted)
+
+def _migration_5(c):
+    """Materialized per-day checklist totals and per-task streaks (filled in by _migration_7)."""
+    c.execute('''
+        CREATE TABLE daily_stats (
+            log_date TEXT PRIMARY KEY,
+            completed INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    c.execute('''
+        CREATE TABLE task_streaks (
+            task_id INTEGER PRIMARY KEY REFERENCES tasks(id) ON DELETE CASCADE,
+            run_end TEXT NOT NULL,
+            run_length INTEGER NOT NULL,
+            longest INTEGER NOT NULL
+        )
+    ''')
+
+# sprints: one row per sprint (regular tasks sharing an end_date), kept current
+# by triggers on tasks. The number column is only a row key (a sprint emptied
+# and filled again gets a new one); readers number sprints in end_date order.
+_IS_SPRINT_TASK = "{t}.task_type != 'resolution' AND {t}.end_date IS NOT NULL"
+# UPDATE OF triggers fire whenever a column is SET, changed or not
+_MOVES_SPRINT = "(NEW.end_date IS NOT OLD.end_date OR NEW.task_type IS NOT OLD.task_type)"
+_SPRINT_START_SQL = "(SELECT MIN(start_date) FROM tasks WHERE end_date = {end_date} AND task_type != 'resolution')"
+
+def _sprint_add_sql(t):
+    # Not an UPSERT: a conflicting insert would still use up an AUTOINCREMENT number
+    return f'''
+        INSERT INTO sprints (end_date, start_date)
+        SELECT {t}.end_date, {t}.start_date WHERE NOT EXISTS (SELECT 1 FROM sprints WHERE end_date = {t}.end_date);
+        UPDATE sprints SET
+            tasks = tasks + 1,
+            progress_sum = progress_sum + COALESCE({t}.progress, 0),
+            completed = completed + (COALESCE({t}.progress, 0) = 100),
+            start_date = COALESCE(MIN(start_date, {t}.start_date), start_date, {t}.start_date)
+        WHERE end_date = {t}.end_date;
+    '''
+
+def _sprint_remove_sql(t):
+    # start_date is a MIN, so it is re-read from the sprint's remaining tasks
+    return f'''
+        UPDATE sprints SET
+            tasks = tasks - 1,
+            progress_sum = progress_sum - COALESCE({t}.progress, 0),
+            completed = completed - (COALESCE({t}.progress, 0) = 100),
+            start_date = {_SPRINT_START_SQL.format(end_date=f"{t}.end_date")}
+        WHERE end_date = {t}.end_date;
+        DELETE FROM sprints WHERE end_date = {t}.end_date AND tasks <= 0;
+    '''
+
+def _migration_6(c):
+    """Materialized sprints table behind get_package_dates() and sprint_summary()."""
+    c.execute('''
+        CREATE TABLE sprints (
+            number INTEGER PRIMARY KEY AUTOINCREMENT,
+            end_date TEXT NOT NULL UNIQUE,
+            start_date TEXT,
+            tasks INTEGER NOT NULL DEFAULT 0,
+            progress_sum INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            efficiency INTEGER GENERATED ALWAYS AS (CASE WHEN tasks > 0 THEN progress_sum / tasks ELSE 0 END) VIRTUAL
+        )
+    ''')
+    _create_sprint_triggers(c)
+    c.execute(_SPRINTS_FROM_TASKS_SQL)
+
+_SPRINTS_FROM_TASKS_SQL = '''
+    INSERT INTO sprints (end_date, start_date, tasks, progress_sum, completed)
+    SELECT end_date, MIN(start_date), COUNT(*), SUM(COALESCE(progress, 0)), SUM(COALESCE(progress, 0) = 100)
+    FROM tasks WHERE task_type != 'resolution' AND end_date IS NOT NULL
+    GROUP BY end_date ORDER BY end_date
+'''
+
+def _create_sprint_triggers(c):
+    c.execute(f'''
+        CREATE TRIGGER trg_sprints_insert AFTER INSERT ON tasks WHEN {_IS_SPRINT_TASK.format(t="NEW")}
+        BEGIN {_sprint_add_sql("NEW")} END
+    ''')
+    c.execute(f'''
+        CREATE TRIGGER trg_sprints_delete AFTER DELETE ON tasks WHEN {_IS_SPRINT_TASK.format(t="OLD")}
+        BEGIN {_sprint_remove_sql("OLD")} END
+    ''')
+    c.execute(f'''
+        CREATE TRIGGER trg_sprints_progress AFTER UPDATE OF progress ON tasks
+        WHEN {_IS_SPRINT_TASK.format(t="NEW")} AND NEW.progress IS NOT OLD.progress AND NOT {_MOVES_SPRINT}
+        BEGIN
+            UPDATE sprints SET
+                progress_sum = progress_sum + COALESCE(NEW.progress, 0) - COALESCE(OLD.progress, 0),
+                completed = completed + (COALESCE(NEW.progress, 0) = 100) - (COALESCE(OLD.progress, 0) = 100)
+            WHERE end_date = NEW.end_date;
+        END
+    ''')
+    c.execute(f'''
+        CREATE TRIGGER trg_sprints_start AFTER UPDATE OF start_date ON tasks
+        WHEN {_IS_SPRINT_TASK.format(t="NEW")} AND NEW.start_date IS NOT OLD.start_date AND NOT {_MOVES_SPRINT}
+        BEGIN
+            UPDATE sprints SET start_date = {_SPRINT_START_SQL.format(end_date="NEW.end_date")}
+            WHERE end_date = NEW.end_date;
+        END
+    ''')
+    # Rare moves between sprints: take the task out of the old one, add it to the new one
+    c.execute(f'''
+        CREATE TRIGGER trg_sprints_move_out AFTER UPDATE OF end_date, task_type ON tasks
+        WHEN {_IS_SPRINT_TASK.format(t="OLD")} AND {_MOVES_SPRINT}
+        BEGIN {_sprint_remove_sql("OLD")} END
+    ''')
+    c.execute(f'''
+        CREATE TRIGGER trg_sprints_move_in AFTER UPDATE OF end_date, task_type ON tasks
+        WHEN {_IS_SPRINT_TASK.format(t="NEW")} AND {_MOVES_SPRINT}
+        BEGIN {_sprint_add_sql("NEW")} END
+    ''')
+
+def _migration_7(c):
+    """
+    Recurrence rule on tasks; daily_logs folded into one completion bitmap per
+    task (see recurrence.py). Only ticked in-span days carry over.
+    """
+    c.execute('ALTER TABLE tasks ADD COLUMN recurrence TEXT')
+    c.execute(f"UPDATE tasks SET recurrence = '{recurrence.DEFAULT_RULE}' WHERE is_daily = 1")
+    c.execute('''
+        CREATE TABLE task_completions (
+            task_id INTEGER PRIMARY KEY REFERENCES tasks(id) ON DELETE CASCADE,
+            bits BLOB NOT NULL
+        )
+    ''')
+    bitmaps = {}
+    for task_id, offset in c.connection.execute('''
+        SELECT d.task_id, CAST(julianday(d.log_date) - julianday(t.start_date) AS INTEGER)
+        FROM daily_logs d JOIN tasks t ON t.id = d.task_id
+        WHERE d.is_complete = 1 AND t.is_daily = 1 AND d.log_date BETWEEN t.start_date AND t.end_date
+    '''):
+        bitmaps[task_id] = bitmaps.get(task_id, 0) | 1 << offset
+    c.executemany('INSERT INTO task_completions (task_id, bits) VALUES (?, ?)',
+                  ((task_id, recurrence.pack(bits)) for task_id, bits in bitmaps.items()))
+    # Its progress triggers (_migration_2) are dropped along with it
+    c.execute('DROP TABLE daily_logs')
+    c.execute('ALTER TABLE task_streaks ADD COLUMN next_due TEXT')
+    _recompute_recurring(c)
+    _rebuild_daily_stats(c)
+    _refresh_streaks(c)
+
+def _migration_8(c):
+    """
+    Sprint triggers that only move a task between sprints when its end_date
+    or task_type actually changes, plus one that re-reads a sprint's
+    start_date when only a task's start_date does. The sprints table is
+    rebuilt to drop any drift the old triggers left behind.
+    """
+    for name in ("insert", "delete", "progress", "start", "move_out", "move_in"):
+        c.execute(f'DROP TRIGGER IF EXISTS trg_sprints_{name}')
+    _create_sprint_triggers(c)
+    c.execute('DELETE FROM sprints')
+    c.execute(_SPRINTS_FROM_TASKS_SQL)
+
+MIGRATIONS = (_migration_1, _migration_2, _migration_3, _migration_4, _migration_5, _migration_6, _migration_7,
+              _migration_8)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def migrate(conn, target=SCHEMA_VERSION):
+    """Brings the database up to target (default SCHEMA_VERSION), tracked in PRAGMA user_version."""
+    if conn.execute('PRAGMA user_version').fetchone()[0] >= target:
+        return False
+    # IMMEDIATE takes the write lock up front so two sessions can't migrate at once
+    conn.execute('BEGIN IMMEDIATE')
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version == 0:
+        create_base_schema(conn)
+    c = conn.cursor()
+    for number, migration in enumerate(MIGRATIONS[version:target], start=version + 1):
+        migration(c)
+        c.execute(f'PRAGMA user_version = {number}')
     conn.commit()
-    conn.close()
+    return True
+
+@traced
+@scoped
+def init_db():
+    with _connect() as conn:
+        migrated = migrate(conn)
+    if migrated:
+        read_cache.invalidate(workspace_file())
+
+@cached_read
+def _package_bounds():
+    with _connect() as conn:
+        # The latest sprint is the package: one step down the sprints end_date index
+        return conn.execute('SELECT start_date, end_date FROM sprints ORDER BY end_date DESC LIMIT 1').fetchone()
 
+@traced
+@scoped
 def get_package_dates():
     """
-    Returns (start_date, end_date) of the CURRENT active package.
+    Returns (start_date, end_date) of the CURRENT active package (the latest sprint).
     Returns (None, None) if the current package has expired or doesn't exist.
     """
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT MIN(start_date), MAX(end_date) FROM tasks WHERE task_type != 'resolution'")
-    res = c.fetchone()
-    conn.close()
+    res = _package_bounds()
     
     if res and res[0] and res[1]:
         s_date = datetime.strptime(res[0], "%Y-%m-%d").date()
@@ -54,83 +894,577 @@ def get_package_dates():
         return s_date, e_date
     return None, None
 
-def add_task_to_db(name, desc, priority, start_dt, end_dt, t_type, is_daily):
+# Every write below is queued on the writer thread (see WriteQueue) and
+# returns a Future; the calling session's own reads wait for it. Call
+# .result() on it to see whether it committed: nothing else raises a failed write.
+
+def _insert_task(conn, params):
+    task_id = conn.execute('''
+        INSERT INTO tasks (name, description, priority, start_date, end_date, task_type, is_daily, recurrence, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', params).lastrowid
+    _, _, _, start, end, _, is_daily, rule, _ = params
+    if is_daily and start <= end:
+        _add_occurrence_totals(conn, rule, date.fromisoformat(start), date.fromisoformat(end), 1)
+    return task_id
+
+@traced
+@scoped
+def add_task_to_db(name, desc, priority, start_dt, end_dt, t_type, is_daily, rule=None):
+    """
+    Queues the insert; the Future resolves to the new task id. A daily task
+    repeats by rule (see recurrence.py), every day if none is given; giving a
+    rule makes the task daily.
+    """
     if isinstance(start_dt, str): start_dt = datetime.strptime(start_dt, "%Y-%m-%d").date()
     if isinstance(end_dt, str): end_dt = datetime.strptime(end_dt, "%Y-%m-%d").date()
+    rule = recurrence.normalize_rule(rule) if is_daily or rule else None
 
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO tasks (name, description, priority, start_date, end_date, task_type, is_daily, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (name, desc, priority, start_dt, end_dt, t_type, 1 if is_daily else 0, date.today()))
-    conn.commit()
-    conn.close()
+    return _submit(_insert_task, (name, desc, priority, str(start_dt), str(end_dt), t_type,
+                                  1 if rule else 0, rule, str(date.today())))
 
+@traced
+@scoped
 def update_task_progress(task_id, new_progress):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('UPDATE tasks SET progress = ? WHERE id = ?', (new_progress, task_id))
-    conn.commit()
-    conn.close()
+    return _submit(_execute, 'UPDATE tasks SET progress = ? WHERE id = ?', (new_progress, task_id))
 
+@traced
+@scoped
 def toggle_daily_status(task_id, log_date, is_checked):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    val = 1 if is_checked else 0
-    c.execute('SELECT id FROM daily_logs WHERE task_id = ? AND log_date = ?', (task_id, log_date))
-    exists = c.fetchone()
-    if exists:
-        c.execute('UPDATE daily_logs SET is_complete = ? WHERE id = ?', (val, exists[0]))
-    else:
-        c.execute('INSERT INTO daily_logs (task_id, log_date, is_complete) VALUES (?, ?, ?)', (task_id, log_date, val))
-    conn.commit()
-    
-    # Auto-Calculate Parent Progress
-    c.execute('SELECT start_date, end_date FROM tasks WHERE id = ?', (task_id,))
-    res = c.fetchone()
-    if res:
-        s_date = datetime.strptime(res[0], "%Y-%m-%d").date()
-        e_date = datetime.strptime(res[1], "%Y-%m-%d").date()
-        total_days = (e_date - s_date).days + 1
-        c.execute('''
-            SELECT COUNT(*) FROM daily_logs 
-            WHERE task_id = ? AND is_complete = 1 AND log_date >= ? AND log_date <= ?
-        ''', (task_id, res[0], res[1]))
-        completed_count = c.fetchone()[0]
-        if total_days > 0:
-            new_pct = int((completed_count / total_days) * 100)
-            c.execute('UPDATE tasks SET progress = ? WHERE id = ?', (new_pct, task_id))
-    conn.commit()
-    conn.close()
+    return set_daily_statuses(task_id, {log_date: is_checked})
+
+@traced
+@scoped
+def set_daily_statuses(task_id, statuses):
+    """
+    Applies {log_date: is_checked} for one task in a single transaction; days
+    that aren't occurrences of its rule are ignored. Progress follows the rule
+    (done occurrences / occurrences in the span), and daily_stats and the
+    task's streak are updated alongside. The Future resolves to the number of
+    days that changed.
+    """
+    return _submit(_set_statuses, task_id, [(date.fromisoformat(str(day)), bool(checked))
+                                            for day, checked in statuses.items()])
+
+def _set_statuses(conn, task_id, rows):
+    task = next(_recurring_tasks(conn, task_id), None)
+    if task is None:
+        return 0
+    _, rule, start, end, bits = task
+    bits, changes = recurrence.tick(rule, start, end, bits, rows)
+    if changes:
+        conn.execute('''
+            INSERT INTO task_completions (task_id, bits) VALUES (?, ?)
+            ON CONFLICT(task_id) DO UPDATE SET bits = excluded.bits
+        ''', (task_id, recurrence.pack(bits)))
+        _store_counters(conn, task_id, rule, start, end, bits)
+        conn.executemany('UPDATE daily_stats SET completed = completed + ? WHERE log_date = ?',
+                         [(delta, str(day)) for delta, day in changes])
+        _store_streak(conn, task_id, rule, start, end, bits)
+    return len(changes)
+
+@traced
+@scoped
+def recompute_all_progress(verify_only=False):
+    """
+    Rebuilds completed_days/progress of every daily task from its completion bitmap.
+    Returns the number of tasks whose stored counters were out of sync
+    (with verify_only=True nothing is written). A repair also rebuilds
+    daily_stats and task_streaks. Repairs run on the writer thread, behind
+    any queued writes, and this waits for them.
+    """
+    if verify_only:
+        with _connect() as conn:
+            return _recompute_recurring(conn.cursor(), verify_only=True)
+    return _submit(_repair_counters).result()
 
-def get_daily_status_map(task_id):
-    conn = sqlite3.connect(DB_FILE)
+def _repair_counters(conn):
     c = conn.cursor()
-    c.execute('SELECT log_date, is_complete FROM daily_logs WHERE task_id = ?', (task_id,))
-    data = {row[0]: bool(row[1]) for row in c.fetchall()}
-    conn.close()
-    return data
+    drifted = _recompute_recurring(c)
+    _rebuild_daily_stats(c)
+    _refresh_streaks(c)
+    return drifted
 
+@traced
+@scoped
+@cached_read
+def get_daily_status_map(task_id, start=None, end=None):
+    """
+    {log_date: is_complete} for every occurrence of a daily task, in date order,
+    optionally only for days in [start, end]. Occurrences are expanded from the
+    task's rule for just that window.
+    """
+    with _connect() as conn:
+        task = next(_recurring_tasks(conn, task_id), None)
+    if task is None:
+        return {}
+    _, rule, t_start, t_end, bits = task
+    lo, hi = (date.fromisoformat(str(d)) if d else None for d in (start, end))
+    return recurrence.status_map(rule, t_start, t_end, bits, lo, hi)
+
+@traced
+@scoped
 def delete_task(task_id):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
-    c.execute('DELETE FROM daily_logs WHERE task_id = ?', (task_id,))
-    conn.commit()
-    conn.close()
+    return _submit(_delete_task, task_id)
+
+def _delete_task(conn, task_id):
+    task = next(_recurring_tasks(conn, task_id), None)
+    if task:
+        # Take the task's occurrences back out of daily_stats before its bitmap goes
+        _, rule, start, end, bits = task
+        conn.executemany('UPDATE daily_stats SET completed = completed - 1 WHERE log_date = ?',
+                         ((str(day),) for day in recurrence.done_days(start, end, bits)))
+        _add_occurrence_totals(conn, rule, start, end, -1)
+        conn.execute('DELETE FROM daily_stats WHERE total <= 0 AND log_date BETWEEN ? AND ?', (str(start), str(end)))
+    # task_completions and task_streaks rows go with it via ON DELETE CASCADE
+    return conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,)).rowcount
 
+# The DataFrame readers import pandas themselves, so importing this module
+# (app.py's startup path) doesn't pay for pandas and pyarrow.
+
+@traced
+@scoped
+@cached_read
 def get_tasks_df():
-    conn = sqlite3.connect(DB_FILE)
-    df = pd.read_sql_query("SELECT * FROM tasks", conn)
-    conn.close()
+    import pandas as pd
+    with _connect() as conn:
+        df = pd.read_sql_query("SELECT * FROM tasks", conn)
     if not df.empty:
         df['end_date'] = pd.to_datetime(df['end_date']).dt.date
         df['start_date'] = pd.to_datetime(df['start_date']).dt.date
     return df
 
+@traced
+@scoped
+@cached_read
 def get_resolutions_df():
-    conn = sqlite3.connect(DB_FILE)
-    df = pd.read_sql_query("SELECT * FROM tasks WHERE task_type = 'resolution'", conn)
-    conn.close()
-    return df
\ No newline at end of file
+    import pandas as pd
+    with _connect() as conn:
+        df = pd.read_sql_query("SELECT * FROM tasks WHERE task_type = 'resolution'", conn)
+    return df
+
+# ==========================================
+# LIGHTWEIGHT RECORDS (no pandas)
+# ==========================================
+
+# Tuple subclass: no per-instance __dict__, dates already parsed to datetime.date
+TaskRecord = namedtuple("TaskRecord", [
+    "id", "name", "description", "priority", "start_date", "end_date", "progress", "task_type", "is_daily",
+])
+
+TASK_RECORD_SQL = '''
+    SELECT id, name, description, priority,
+           start_date AS "start_date [isodate]", end_date AS "end_date [isodate]",
+           progress, task_type, is_daily
+    FROM tasks
+'''
+
+_SHARED_STRINGS = {}
+
+_RECORD_FILTERS = {
+    None: ("", ()),
+    "resolution": ("WHERE task_type = ?", ("resolution",)),
+    "regular": ("WHERE task_type != ?", ("resolution",)),
+}
+
+@scoped
+def iter_task_records(kind=None, batch_size=1000):
+    """
+    Streams TaskRecords in id order without building a DataFrame or a full list.
+    kind: None (all tasks), "resolution" or "regular" (everything else).
+    """
+    # Resolved now: the generator body runs later, outside any workspace= scope
+    return _iter_records(workspace_file(), kind, batch_size)
+
+def _iter_records(db_file, kind, batch_size):
+    where, params = _RECORD_FILTERS[kind]
+    # priority/task_type take a few distinct values: share one str object per value
+    share = _SHARED_STRINGS.setdefault
+    with _connect(db_file) as conn:
+        cursor = conn.execute(f"{TASK_RECORD_SQL} {where} ORDER BY id", params)
+        while rows := cursor.fetchmany(batch_size):
+            for r in rows:
+                yield TaskRecord(r[0], r[1], r[2], share(r[3], r[3]), r[4], r[5], r[6], share(r[7], r[7]), r[8])
+
+@traced
+@scoped
+@cached_read
+def get_task_records(kind=None):
+    """List form of iter_task_records (cached per DB generation)."""
+    return list(iter_task_records(kind))
+
+TaskPage = namedtuple("TaskPage", "records total")
+
+# Sidebar order: regular tasks by priority (unknown last), then least progress first
+_PRIORITY_RANK_SQL = "CASE priority WHEN 'High' THEN 0 WHEN 'Medium' THEN 1 WHEN 'Low' THEN 2 ELSE 3 END"
+_PAGE_ORDER = {None: "id", "resolution": "id", "regular": f"{_PRIORITY_RANK_SQL}, progress, id"}
+
+@traced
+@scoped
+@cached_read
+def get_task_page(kind=None, limit=20, offset=0, active_on=None):
+    """
+    One LIMIT/OFFSET page of TaskRecords plus the total number of matching rows,
+    so lists render a bounded number of widgets however many tasks exist.
+    active_on keeps tasks ending on or after that date (the active ones).
+    """
+    where, params = _RECORD_FILTERS[kind]
+    if active_on is not None:
+        where += f" {'AND' if where else 'WHERE'} end_date >= ?"
+        params += (str(active_on),)
+    with _connect() as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"{TASK_RECORD_SQL} {where} ORDER BY {_PAGE_ORDER[kind]} LIMIT ? OFFSET ?", params + (limit, offset)
+        ).fetchall()
+    return TaskPage([TaskRecord._make(r) for r in rows], total)
+
+# ==========================================
+# FULL-TEXT SEARCH
+# ==========================================
+
+SEARCH_SQL = '''
+    SELECT t.id, t.name, t.description, t.priority,
+           t.start_date AS "start_date [isodate]", t.end_date AS "end_date [isodate]",
+           t.progress, t.task_type, t.is_daily
+    FROM tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid
+    WHERE tasks_fts MATCH ? {filters}
+    ORDER BY bm25(tasks_fts, 10.0, 1.0), t.id DESC
+    LIMIT ? OFFSET ?
+'''
+
+def fts_query(text):
+    """
+    Turns free text into a safe FTS5 query: every word must match, as a prefix.
+    Quotes are dropped so user input can never be parsed as FTS syntax.
+    """
+    words = text.replace('"', " ").split()
+    return " ".join(f'"{w}"*' for w in words)
+
+@traced
+@scoped
+@cached_read
+def search_tasks(query, limit=20, offset=0, date_range=None, priority=None):
+    """
+    Ranked TaskRecords whose name or description match query (name hits weigh more).
+    date_range=(start, end) keeps tasks overlapping it; priority filters exactly.
+    Page through results with limit/offset.
+    """
+    match = fts_query(query)
+    if not match:
+        return []
+    filters, params = "", [match]
+    if date_range:
+        filters += " AND t.end_date >= ? AND t.start_date <= ?"
+        params += [str(date_range[0]), str(date_range[1])]
+    if priority:
+        filters += " AND t.priority = ?"
+        params.append(priority)
+    with _connect() as conn:
+        rows = conn.execute(SEARCH_SQL.format(filters=filters), params + [limit, offset]).fetchall()
+    return [TaskRecord._make(r) for r in rows]
+
+@traced
+@scoped
+@cached_read
+def has_regular_tasks():
+    with _connect() as conn:
+        return bool(conn.execute("SELECT EXISTS(SELECT 1 FROM tasks WHERE task_type != 'resolution')").fetchone()[0])
+
+@cached_read
+def _events_in_range(start, end):
+    import pandas as pd
+    with _connect() as conn:
+        # end_date >= start is a range scan on idx_tasks_reg_end; the unary + keeps
+        # the planner off the start_date index, which would scan all older history
+        df = pd.read_sql_query('''
+            SELECT * FROM tasks
+            WHERE task_type != 'resolution' AND end_date >= ? AND +start_date <= ?
+        ''', conn, params=(start, end))
+    if not df.empty:
+        df['end_date'] = pd.to_datetime(df['end_date']).dt.date
+        df['start_date'] = pd.to_datetime(df['start_date']).dt.date
+    return df
+
+@traced
+@scoped
+def get_events_in_range(start, end=None):
+    """
+    Non-resolution tasks overlapping [start, end] (inclusive). end=None means open-ended.
+    Same columns as get_tasks_df.
+    """
+    return _events_in_range(str(start), str(end) if end else "9999-12-31")
+
+@traced
+@scoped
+@cached_read
+def sprint_summary():
+    """
+    One row per sprint (tasks sharing an end_date), oldest first:
+    sprint number, end_date, efficiency (avg progress), tasks, completed.
+    Read straight from the sprints table. Sprints are numbered 1, 2, ... by
+    end_date, however their rows were created (migration, import, triggers).
+    """
+    import pandas as pd
+    with _connect() as conn:
+        return pd.read_sql_query('''
+            SELECT ROW_NUMBER() OVER (ORDER BY end_date) AS sprint, end_date, efficiency, tasks, completed
+            FROM sprints
+            ORDER BY end_date
+        ''', conn)
+
+@traced
+@scoped
+@cached_read
+def get_sprint_tasks(end_date):
+    """Task detail rows for the sprint ending on end_date."""
+    import pandas as pd
+    with _connect() as conn:
+        df = pd.read_sql_query('''
+            SELECT name, start_date, end_date, progress, priority FROM tasks
+            WHERE task_type != 'resolution' AND end_date = ?
+        ''', conn, params=(str(end_date),))
+    if not df.empty:
+        df['end_date'] = pd.to_datetime(df['end_date']).dt.date
+        df['start_date'] = pd.to_datetime(df['start_date']).dt.date
+    return df
+
+# ==========================================
+# DAILY STATS & STREAKS
+# ==========================================
+
+StreakRecord = namedtuple("StreakRecord", "task_id name recurrence current longest run_end")
+
+@traced
+@scoped
+@cached_read
+def get_daily_stats(start, end):
+    """{'YYYY-MM-DD': (completed, total)} for days in [start, end] with checklist items due."""
+    with _connect() as conn:
+        rows = conn.execute(
+            'SELECT log_date, completed, total FROM daily_stats WHERE log_date BETWEEN ? AND ?', (str(start), str(end))
+        ).fetchall()
+    return {day: (done, total) for day, done, total in rows}
+
+@traced
+@scoped
+def get_streaks(today=None):
+    """
+    StreakRecords for daily tasks with at least one ticked day, best current streak first.
+    Streak lengths count occurrences of the task's rule (see recurrence.run_label);
+    they are ranked by the days they cover (recurrence.run_days), so a 3-week
+    streak outranks a 10-day one.
+    A streak is still current until an occurrence after its last ticked one is
+    missed: for an every-day task, if it was last ticked today or yesterday.
+    """
+    return _streaks(str(today or date.today()))
+
+@cached_read
+def _streaks(today):
+    with _connect() as conn:
+        rows = conn.execute('''
+            SELECT s.task_id, t.name, t.recurrence,
+                   CASE WHEN s.next_due >= ? THEN s.run_length ELSE 0 END AS current,
+                   s.longest, s.run_end
+            FROM task_streaks s JOIN tasks t ON t.id = s.task_id
+            ORDER BY t.name
+        ''', (today,)).fetchall()
+    records = [StreakRecord._make(r) for r in rows]
+    # Counts are in each rule's own unit, so rank by days covered (stable sort keeps names in order)
+    records.sort(key=lambda r: (recurrence.run_days(r.recurrence, r.current),
+                                recurrence.run_days(r.recurrence, r.longest)), reverse=True)
+    return records
+
+# ==========================================
+# BULK IMPORT / EXPORT
+# ==========================================
+
+TASK_COLUMNS = ("id", "name", "description", "priority", "start_date", "end_date",
+                "progress", "task_type", "is_daily", "recurrence", "created_at")
+LOG_COLUMNS = ("task_id", "log_date", "is_complete")
+BATCH_SIZE = 10000
+
+def logs_path(path):
+    """Sibling file holding the daily logs of a task export: backup.csv -> backup.logs.csv"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.logs{ext}"
+
+def _format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".csv", ".jsonl", ".parquet"):
+        raise ValueError(f"Unsupported format '{ext}' (use .csv, .jsonl or .parquet)")
+    return ext
+
+def read_records(path):
+    """Streams dict rows from a .csv, .jsonl or .parquet file."""
+    ext = _format(path)
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE):
+            yield from batch.to_pylist()
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        if ext == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def _write_records(path, columns, records):
+    """Streams rows (a cursor or any iterable of tuples) to path in batches; returns the row count."""
+    ext = _format(path)
+    count = 0
+    if ext == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            while rows := list(islice(records, BATCH_SIZE)):
+                table = pa.Table.from_pylist([dict(zip(columns, row)) for row in rows])
+                if writer is None:
+                    # A column that is all NULL in the first batch (say, recurrence) is stored as text
+                    writer = pq.ParquetWriter(path, pa.schema(
+                        [f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in table.schema]))
+                writer.write_table(table.cast(writer.schema))
+                count += len(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            pq.write_table(pa.table({col: [] for col in columns}), path)
+        return count
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if ext == ".csv":
+            out = csv.writer(f)
+            out.writerow(columns)
+        while rows := list(islice(records, BATCH_SIZE)):
+            if ext == ".csv":
+                out.writerows(rows)
+            else:
+                f.writelines(json.dumps(dict(zip(columns, row))) + "\n" for row in rows)
+            count += len(rows)
+    return count
+
+def _blank_to_none(value):
+    # CSV has no NULL: empty cells come back as ""
+    return None if value == "" else value
+
+def _date_str(value):
+    return None if value in (None, "") else str(value)[:10]
+
+def _task_params(records):
+    for r in records:
+        rule = _blank_to_none(r.get("recurrence"))
+        # Exports from before recurrence rules have daily tasks without one
+        rule = recurrence.normalize_rule(rule) if int(_blank_to_none(r.get("is_daily")) or 0) or rule else None
+        yield (
+            _blank_to_none(r.get("id")), r["name"], _blank_to_none(r.get("description")), r.get("priority"),
+            _date_str(r.get("start_date")), _date_str(r.get("end_date")),
+            _blank_to_none(r.get("progress")) or 0, r.get("task_type") or "regular",
+            1 if rule else 0, rule, _date_str(r.get("created_at")) or str(date.today()),
+        )
+
+def _log_params(records):
+    for r in records:
+        yield (int(r["task_id"]), _date_str(r["log_date"]), int(_blank_to_none(r.get("is_complete")) or 0))
+
+@traced
+@scoped
+def import_tasks(tasks, logs=None):
+    """
+    Bulk-inserts tasks (and optionally daily logs) in a single transaction.
+    tasks/logs are iterables of dict rows or file paths (.csv/.jsonl/.parquet);
+    rows are streamed, never held in memory all at once: tasks through
+    executemany, logs folded into the tasks' completion bitmaps (log rows for
+    days that aren't occurrences of the task's rule are dropped).
+    A task path picks up its logs_path() sibling automatically when present.
+    Task rows that carry an id keep it, so an export restores as-is into an
+    empty database. Queued like every write; the Future resolves to
+    (tasks_imported, logs_imported).
+    """
+    if isinstance(tasks, (str, os.PathLike)):
+        if logs is None and os.path.exists(logs_path(tasks)):
+            logs = logs_path(tasks)
+        tasks = read_records(tasks)
+    if isinstance(logs, (str, os.PathLike)):
+        logs = read_records(logs)
+
+    return _submit(_import_rows, tasks, logs)
+
+def _import_rows(conn, tasks, logs):
+    c = conn.cursor()
+    # AUTOINCREMENT ids land above every id in use; rows that bring their own id are noted as they stream by
+    last_id = c.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()
+    last_id = max(last_id[0] if last_id else 0, c.execute('SELECT COALESCE(MAX(id), 0) FROM tasks').fetchone()[0])
+    given_ids = set()
+
+    def params():
+        for row in _task_params(tasks):
+            if row[0] is not None and row[8]:
+                given_ids.add(int(row[0]))
+            yield row
+
+    c.executemany('''
+        INSERT INTO tasks (id, name, description, priority, start_date, end_date, progress, task_type, is_daily,
+                           recurrence, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', params())
+    n_tasks = c.rowcount
+
+    # Only the imported daily tasks and the tasks the logs tick are touched:
+    # their occurrences go into daily_stats, then their counters and streaks are redone
+    new_ids = given_ids.union(row[0] for row in c.execute(
+        'SELECT id FROM tasks WHERE id > ? AND is_daily = 1', (last_id,)))
+    touched = {}
+    for task_id in sorted(new_ids):
+        task = next(_recurring_tasks(conn, task_id), None)
+        if task:
+            touched[task_id] = list(task)
+            _add_occurrence_totals(c, *task[1:4], 1)
+
+    n_logs = 0
+    changed, ticked = Counter(), set()
+    if logs is not None:
+        for task_id, day, done in _log_params(logs):
+            n_logs += 1
+            if task_id not in touched:
+                task = next(_recurring_tasks(conn, task_id), None)
+                touched[task_id] = task and list(task)
+            task = touched[task_id]
+            if task:
+                task[4], changes = recurrence.tick(*task[1:], [(date.fromisoformat(day), done)])
+                for delta, when in changes:
+                    changed[when] += delta
+                    ticked.add(task_id)
+        touched = {task_id: task for task_id, task in touched.items() if task}
+        c.executemany('''
+            INSERT INTO task_completions (task_id, bits) VALUES (?, ?)
+            ON CONFLICT(task_id) DO UPDATE SET bits = excluded.bits
+        ''', ((task_id, recurrence.pack(touched[task_id][4])) for task_id in ticked))
+        c.executemany('UPDATE daily_stats SET completed = completed + ? WHERE log_date = ?',
+                      ((delta, str(day)) for day, delta in changed.items() if delta))
+
+    for task in touched.values():
+        _store_counters(c, *task)
+        _store_streak(c, *task)
+    return n_tasks, n_logs
+
+@traced
+@scoped
+def export_tasks(path):
+    """
+    Streams every task to path and every ticked occurrence (one daily log row
+    per done day, expanded from the bitmaps) to logs_path(path), in the format
+    given by the extension. Both come from one read snapshot.
+    Returns (tasks_exported, logs_exported).
+    """
+    with _connect() as conn:
+        conn.execute('BEGIN')
+        cols = ", ".join(TASK_COLUMNS)
+        n_tasks = _write_records(path, TASK_COLUMNS, conn.execute(f'SELECT {cols} FROM tasks ORDER BY id'))
+        n_logs = _write_records(logs_path(path), LOG_COLUMNS, (
+            (task_id, str(day), 1)
+            for task_id, _, start, end, bits in _recurring_tasks(conn)
+            for day in recurrence.done_days(start, end, bits)))
+    return n_tasks, n_logs
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Lightweight per-rerun timing of database calls and named app stages.
+
+Recording is per thread (Streamlit runs each session's script on its own
+thread). With no recorder active, traced functions and stages cost one
+thread-local attribute lookup.
+"""
+import functools
+import json
+import threading
+import time
+
+_local = threading.local()
+
+class Recorder:
+    """
+    Collects spans (name, start, duration, rows, nested) for one script run.
+    nested marks a traced call made from inside another traced call.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.depth = 0
+
+    def add(self, name, start, duration, rows=None):
+        self.spans.append((name, start - self.origin, duration, rows, self.depth > 0))
+
+    def total_ms(self, prefix=""):
+        """Time in spans whose name starts with prefix, not double counting nested traced calls."""
+        return sum(d for n, _, d, _, nested in self.spans if not nested and n.startswith(prefix)) * 1000
+
+    def summary(self):
+        """One row per name: count, total/mean/max milliseconds and rows returned, slowest first."""
+        agg = {}
+        for name, _, duration, rows, _ in self.spans:
+            a = agg.setdefault(name, {"name": name, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0})
+            a["count"] += 1
+            a["total_ms"] += duration * 1000
+            a["max_ms"] = max(a["max_ms"], duration * 1000)
+            a["rows"] += rows or 0
+        for a in agg.values():
+            a["mean_ms"] = a["total_ms"] / a["count"]
+        return sorted(agg.values(), key=lambda a: a["total_ms"], reverse=True)
+
+    def to_json(self):
+        spans = [{"name": n, "start_ms": s * 1000, "duration_ms": d * 1000, "rows": r} for n, s, d, r, _ in self.spans]
+        return json.dumps({"spans": spans, "summary": self.summary()}, indent=2)
+
+    def to_chrome_trace(self):
+        """Trace Event Format, loadable in chrome://tracing or Perfetto."""
+        events = [
+            {"name": n, "cat": n.split(".")[0], "ph": "X", "ts": s * 1e6, "dur": d * 1e6,
+             "pid": 1, "tid": 1, "args": {} if r is None else {"rows": r}}
+            for n, s, d, r, _ in self.spans
+        ]
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+
+def start_recording():
+    _local.recorder = Recorder()
+    return _local.recorder
+
+def stop_recording():
+    recorder = getattr(_local, "recorder", None)
+    _local.recorder = None
+    return recorder
+
+def current_recorder():
+    return getattr(_local, "recorder", None)
+
+def _rows(result):
+    if isinstance(result, (list, dict)) or hasattr(result, "shape"):
+        return len(result)
+    return None
+
+def traced(fn):
+    """Records calls to fn as 'db.<name>' spans while a recorder is active."""
+    name = f"db.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        recorder = getattr(_local, "recorder", None)
+        if recorder is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        recorder.depth += 1
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            recorder.depth -= 1
+        recorder.add(name, start, time.perf_counter() - start, _rows(result))
+        return result
+    return wrapper
+
+class stage:
+    """
+    Context manager timing a named block:
+        with stage("dashboard.build_events") as s:
+            events = build_events(df)
+            s.rows = len(events)
+    """
+    __slots__ = ("name", "rows", "_recorder", "_start")
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+        self._recorder = getattr(_local, "recorder", None)
+
+    def __enter__(self):
+        if self._recorder is not None:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._recorder is not None:
+            self._recorder.add(self.name, self._start, time.perf_counter() - self._start, self.rows)
+        return False
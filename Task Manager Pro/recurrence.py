@@ -0,0 +1,220 @@
+"""
+Recurrence rules for checklist (is_daily) tasks, and the bitmaps recording
+which of their occurrences are done. Pure Python with no database or
+Streamlit imports: occurrences are worked out for whatever window is asked
+for and never stored.
+
+Rules are stored as text in tasks.recurrence:
+    daily       every day of the task's span
+    weekdays    Monday to Friday
+    weekly      every 7 days from the start date
+    every:N     every N days from the start date
+
+A completion bitmap is an int (stored as little-endian bytes) whose bit i
+stands for start_date + i days. Only occurrences inside the span are ever
+set, so a year-long daily habit fits in 46 bytes.
+"""
+from datetime import timedelta
+from functools import lru_cache
+
+DEFAULT_RULE = "daily"
+RULE_CHOICES = ("daily", "weekdays", "weekly", "every:2", "every:3")
+ONE_DAY = timedelta(days=1)
+
+# ==========================================
+# RULES
+# ==========================================
+
+@lru_cache(maxsize=None)
+def parse_rule(rule):
+    """(step_days, weekdays_only) for a rule string; None means DEFAULT_RULE."""
+    text = (rule or DEFAULT_RULE).strip().lower()
+    if text == "daily":
+        return 1, False
+    if text == "weekdays":
+        return 1, True
+    if text == "weekly":
+        return 7, False
+    kind, _, n = text.partition(":")
+    if kind == "every" and n.isdigit() and int(n) > 0:
+        return int(n), False
+    raise ValueError(f"Unknown recurrence rule '{rule}' (use daily, weekdays, weekly or every:N)")
+
+def normalize_rule(rule):
+    """Canonical spelling of a rule: every:1 -> daily, every:7 -> weekly."""
+    step, weekdays = parse_rule(rule)
+    if weekdays:
+        return "weekdays"
+    return {1: "daily", 7: "weekly"}.get(step, f"every:{step}")
+
+def rule_label(rule):
+    step, weekdays = parse_rule(rule)
+    if weekdays:
+        return "Weekdays"
+    return {1: "Every day", 7: "Weekly"}.get(step, f"Every {step} days")
+
+def run_label(rule, n):
+    """A run of n consecutive occurrences in the rule's own unit: "5 days", "3 weeks"."""
+    step, weekdays = parse_rule(rule)
+    unit = "weekday" if weekdays else {1: "day", 7: "week"}.get(step)
+    if unit is None:
+        return f"{n} × every {step} days"
+    return f"{n} {unit}" + ("" if n == 1 else "s")
+
+def run_days(rule, n):
+    """
+    Calendar days a run of n consecutive occurrences keeps the habit going,
+    so runs on different rules compare: 3 weeks (21) outranks 10 days.
+    Five weekdays carry over the weekend they skip.
+    """
+    step, weekdays = parse_rule(rule)
+    if weekdays:
+        weeks, rest = divmod(n, 5)
+        return weeks * 7 + rest
+    return n * step
+
+# ==========================================
+# OCCURRENCES
+# ==========================================
+
+def _weekdays_through(start, day):
+    """Monday-to-Friday days in [start, day]."""
+    days = (day - start).days + 1
+    if days <= 0:
+        return 0
+    weeks, rest = divmod(days, 7)
+    first = start.weekday()
+    return weeks * 5 + sum((first + i) % 7 < 5 for i in range(rest))
+
+def count_through(rule, start, day):
+    """Occurrences in [start, day], ignoring where the span ends."""
+    step, weekdays = parse_rule(rule)
+    if day < start:
+        return 0
+    if weekdays:
+        return _weekdays_through(start, day)
+    return (day - start).days // step + 1
+
+def count(rule, start, end, lo=None, hi=None):
+    """Occurrences in the span [start, end], optionally only those in [lo, hi]."""
+    first = max(start, lo) if lo else start
+    last = min(end, hi) if hi else end
+    if first > last:
+        return 0
+    return count_through(rule, start, last) - count_through(rule, start, first - ONE_DAY)
+
+def is_occurrence(rule, start, end, day):
+    if not start <= day <= end:
+        return False
+    step, weekdays = parse_rule(rule)
+    return day.weekday() < 5 if weekdays else (day - start).days % step == 0
+
+def nth(rule, start, n):
+    """The n-th occurrence (0-based) from start, ignoring where the span ends."""
+    step, weekdays = parse_rule(rule)
+    if not weekdays:
+        return start + timedelta(days=n * step)
+    day = start
+    while day.weekday() >= 5:
+        day += ONE_DAY
+    weeks, rest = divmod(n, 5)
+    day += timedelta(weeks=weeks)
+    for _ in range(rest):
+        day += ONE_DAY
+        while day.weekday() >= 5:
+            day += ONE_DAY
+    return day
+
+def next_after(rule, start, day):
+    """First occurrence after day, ignoring where the span ends."""
+    return nth(rule, start, count_through(rule, start, day))
+
+def occurrences(rule, start, end, lo=None, hi=None):
+    """Lazily yields the occurrence dates in [start, end], optionally only those in [lo, hi]."""
+    step, weekdays = parse_rule(rule)
+    last = min(end, hi) if hi else end
+    day = nth(rule, start, count_through(rule, start, lo - ONE_DAY) if lo else 0)
+    while day <= last:
+        yield day
+        day += timedelta(days=step)
+        while weekdays and day.weekday() >= 5:
+            day += ONE_DAY
+
+# ==========================================
+# COMPLETION BITMAPS
+# ==========================================
+
+def unpack(blob):
+    return int.from_bytes(blob or b"", "little")
+
+def pack(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+def _set_offsets(bits):
+    """Offsets of the set bits, lowest first."""
+    text = bin(bits)[:1:-1]
+    i = text.find("1")
+    while i >= 0:
+        yield i
+        i = text.find("1", i + 1)
+
+def _window(start, end, bits, lo, hi):
+    """(first day, bits shifted so bit 0 is that day) for [start, end] clipped to [lo, hi]."""
+    first = max(start, lo) if lo else start
+    last = min(end, hi) if hi else end
+    if first > last:
+        return first, 0
+    return first, (bits >> (first - start).days) & ((1 << ((last - first).days + 1)) - 1)
+
+def done_days(start, end, bits, lo=None, hi=None):
+    """Yields the done days in [start, end], optionally only those in [lo, hi]."""
+    first, window = _window(start, end, bits, lo, hi)
+    for offset in _set_offsets(window):
+        yield first + timedelta(days=offset)
+
+def count_done(start, end, bits, lo=None, hi=None):
+    return bin(_window(start, end, bits, lo, hi)[1]).count("1")
+
+def status_map(rule, start, end, bits, lo=None, hi=None):
+    """{'YYYY-MM-DD': done} for every occurrence in the window, in date order."""
+    return {str(day): bool(bits >> (day - start).days & 1) for day in occurrences(rule, start, end, lo, hi)}
+
+def tick(rule, start, end, bits, statuses):
+    """
+    Applies (day, done) pairs to a bitmap, skipping days that aren't occurrences.
+    Returns (bits, changes) where changes lists (+1 or -1, day) per day that flipped.
+    """
+    changes = []
+    for day, done in statuses:
+        if not is_occurrence(rule, start, end, day):
+            continue
+        bit = 1 << (day - start).days
+        if bool(bits & bit) != bool(done):
+            bits ^= bit
+            changes.append((1 if done else -1, day))
+    return bits, changes
+
+def progress(rule, start, end, bits):
+    """Percent of occurrences done, or None if the span holds no occurrence."""
+    total = count(rule, start, end)
+    return count_done(start, end, bits) * 100 // total if total else None
+
+def latest_run(rule, start, end, bits):
+    """
+    (run_end, run_length, longest) over runs of consecutive done occurrences
+    (a weekly habit ticked five weeks running is a run of 5), or None if
+    nothing is done.
+    """
+    step, weekdays = parse_rule(rule)
+    days = bin(_window(start, end, bits, None, None)[1])[:1:-1]
+    # One '1'/'0' per occurrence in order, so runs are just runs of '1'
+    if weekdays:
+        first = start.weekday()
+        flags = "".join(c for i, c in enumerate(days) if (first + i) % 7 < 5)
+    else:
+        flags = days[::step]
+    flags = flags.rstrip("0")
+    if not flags:
+        return None
+    return (nth(rule, start, len(flags) - 1), len(flags) - len(flags.rstrip("1")),
+            max(map(len, flags.split("0"))))
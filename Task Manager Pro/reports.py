@@ -0,0 +1,321 @@
+"""
+Analytics report export: the sprint efficiency chart, current sprint status
+pie and per-sprint task tables, rendered to one static HTML file (or a PDF
+when kaleido and pypdf are installed) by a pool of worker processes, so
+neither the figure building nor a year of sprint tables runs on the
+Streamlit thread.
+
+start_report() returns a ReportJob straight away. A background thread reads
+the data, fans the sections out to the pool and updates the job's progress
+as they come back. Finished reports are kept per workspace and data
+generation, so exporting again before anything changes is instant.
+"""
+import atexit
+import html
+import importlib.util
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+
+import database as db
+from builders import sprint_frame
+
+REPORT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))   # leave a core to the UI
+SPRINTS_PER_SECTION = 13    # sprint tables rendered per pool task (a quarter of weekly sprints)
+REPORT_CACHE_SIZE = 8       # finished reports kept, least recently used dropped first
+FORMATS = {"html": "text/html", "pdf": "application/pdf"}
+PDF_PAGE_SIZE = (1000, 700)     # px per PDF page: each chart, and each slice of a sprint's tasks
+PDF_ROWS_PER_PAGE = 20          # task rows per PDF table page
+
+# ==========================================
+# FIGURES (shared with the Analytics page)
+# ==========================================
+
+def efficiency_figure(sprints, height=300):
+    """Efficiency bar per sprint from a builders.sprint_frame()."""
+    import plotly.express as px
+    fig = px.bar(
+        sprints,
+        x="Sprint",
+        y="Efficiency",
+        text="Efficiency",
+        color="Efficiency",
+        color_continuous_scale="Blues",
+        range_y=[0, 100]
+    )
+    fig.update_traces(texttemplate='%{text}%', textposition='outside')
+    fig.update_layout(height=height, margin=dict(t=30, b=10, l=10, r=10), coloraxis_showscale=False)
+    return fig
+
+def status_figure(sprint, height=300):
+    """Completed vs. pending donut for one sprint_frame() row."""
+    import plotly.express as px
+    done_count = int(sprint['Completed'])
+    pending_count = int(sprint['Tasks']) - done_count
+    fig = px.pie(
+        {"Status": ["Completed", "Pending"], "Count": [done_count, pending_count]},
+        values='Count',
+        names='Status',
+        color='Status',
+        color_discrete_map={"Completed": "#00CC96", "Pending": "#FF4B4B"},
+        hole=0.4
+    )
+    fig.update_layout(
+        height=height,
+        margin=dict(t=10, b=10, l=10, r=10),
+        showlegend=True,
+        annotations=[dict(text=f"{sprint['Sprint']}", x=0.5, y=0.5, font_size=14, showarrow=False)]
+    )
+    return fig
+
+# ==========================================
+# SECTION RENDERERS (run in the worker processes)
+# ==========================================
+
+def render_efficiency(sprints):
+    # First section of the page, so it carries plotly.js for the others (self-contained file)
+    return efficiency_figure(sprints, height=360).to_html(full_html=False, include_plotlyjs=True)
+
+def render_status(sprints):
+    return status_figure(sprints.iloc[-1]).to_html(full_html=False, include_plotlyjs=False)
+
+def _sprint_heading(sprint):
+    return (f"{sprint['Sprint']} · ends {sprint['End Date']} · {sprint['Efficiency']}% efficiency · "
+            f"{sprint['Completed']}/{sprint['Tasks']} done")
+
+def render_sprint_tables(chunk):
+    """<section> per sprint for [(sprint_frame row dict, task DataFrame), ...]."""
+    parts = []
+    for sprint, tasks in chunk:
+        parts.append(
+            f"<section><h3>{html.escape(_sprint_heading(sprint))}</h3>"
+            f"{tasks.to_html(index=False, border=0, classes='tasks')}</section>"
+        )
+    return "".join(parts)
+
+# PDF sections come back as lists of single-page PDFs, merged in order by _merge_pdf
+
+def _pdf_pages(figs):
+    """One single-page PDF per figure, all rendered in one kaleido session (needs kaleido >= 1 and Chrome)."""
+    import plotly.io as pio
+    width, height = PDF_PAGE_SIZE
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = [os.path.join(workdir, f"{i}.pdf") for i in range(len(figs))]
+        pio.write_images(figs, paths, format="pdf", width=width, height=height)
+        pages = []
+        for path in paths:
+            with open(path, "rb") as f:
+                pages.append(f.read())
+    return pages
+
+def render_charts_pdf(sprints):
+    """A page each for the efficiency chart and the current sprint pie."""
+    height = PDF_PAGE_SIZE[1]
+    margin = dict(t=70, b=30, l=30, r=30)
+    return _pdf_pages([
+        efficiency_figure(sprints, height=height).update_layout(title="Sprint efficiency", margin=margin),
+        status_figure(sprints.iloc[-1], height=height).update_layout(title="Current sprint status", margin=margin),
+    ])
+
+def render_sprint_tables_pdf(chunk):
+    """Table pages for [(sprint_frame row dict, task DataFrame), ...], PDF_ROWS_PER_PAGE tasks per page."""
+    import plotly.graph_objects as go
+    figs = []
+    for sprint, tasks in chunk:
+        columns = list(tasks.columns)
+        rows = tasks.astype(str).values.tolist()
+        for start in range(0, max(len(rows), 1), PDF_ROWS_PER_PAGE):
+            page = rows[start:start + PDF_ROWS_PER_PAGE]
+            fig = go.Figure(go.Table(
+                header=dict(values=columns, align="left", fill_color="#f0f2f6"),
+                cells=dict(values=[list(col) for col in zip(*page)] or [[] for _ in columns], align="left"),
+            ))
+            title = _sprint_heading(sprint) + (" (continued)" if start else "")
+            figs.append(fig.update_layout(title=title, margin=dict(t=70, b=30, l=30, r=30)))
+    return _pdf_pages(figs)
+
+def _merge_pdf(pages):
+    from pypdf import PdfWriter
+    writer = PdfWriter()
+    for page in pages:
+        writer.append(io.BytesIO(page))
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+  body {{ font-family: system-ui, sans-serif; margin: 2rem auto; max-width: 1100px; color: #262730; }}
+  .metrics {{ display: flex; gap: 3rem; margin: 1rem 0 2rem; }}
+  .metrics b {{ display: block; font-size: 1.8rem; }}
+  .charts {{ display: grid; grid-template-columns: 2fr 1fr; gap: 1rem; }}
+  table.tasks {{ border-collapse: collapse; width: 100%; margin-bottom: 1.5rem; font-size: 0.9rem; }}
+  table.tasks th, table.tasks td {{ border-bottom: 1px solid #e6e6e6; padding: 4px 8px; text-align: left; }}
+  h3 {{ font-size: 1rem; margin: 1.5rem 0 0.5rem; }}
+</style></head>
+<body>
+<h1>{title}</h1>
+<p>Generated {generated}</p>
+<div class="metrics">
+  <div>Total Tasks<b>{total}</b></div><div>Completed Tasks<b>{completed}</b></div>
+  <div>Avg Sprint Efficiency<b>{efficiency}%</b></div>
+</div>
+<div class="charts"><div>{chart}</div><div>{pie}</div></div>
+<h2>Sprint Details</h2>
+{tables}
+</body></html>
+"""
+
+# ==========================================
+# JOBS
+# ==========================================
+
+def available_formats():
+    """Formats this install can produce: PDF needs kaleido (which in turn needs Chrome) and pypdf."""
+    return [fmt for fmt in FORMATS
+            if fmt != "pdf" or (importlib.util.find_spec("kaleido") and importlib.util.find_spec("pypdf"))]
+
+class ReportJob:
+    """One export's progress and result. The builder thread fills it in; the UI only reads it."""
+
+    def __init__(self, fmt, workspace, key):
+        self.fmt = fmt
+        self.workspace = workspace
+        self.key = key
+        self.stage = "Queued"
+        self.done = 0
+        self.total = 1
+        self.data = None
+        self.error = None
+        self.elapsed = None
+        self.started = time.perf_counter()
+        self.finished = threading.Event()
+
+    @property
+    def progress(self):
+        return min(1.0, self.done / self.total)
+
+    @property
+    def running(self):
+        return not self.finished.is_set()
+
+    @property
+    def filename(self):
+        return f"{self.workspace}-report-{date.today()}.{self.fmt}"
+
+    @property
+    def mime(self):
+        return FORMATS[self.fmt]
+
+    def wait(self, timeout=None):
+        self.finished.wait(timeout)
+        return self
+
+_jobs = OrderedDict()       # (db_file, data generation, fmt) -> ReportJob, running or finished
+_lock = threading.Lock()
+_pool = None
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # spawn: forking a process that runs the writer and Streamlit threads is unsafe
+            _pool = ProcessPoolExecutor(REPORT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def shutdown():
+    """Stops the worker processes (registered with atexit)."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+atexit.register(shutdown)
+
+def start_report(fmt="html", workspace=None):
+    """
+    Starts exporting the workspace's Analytics report and returns its ReportJob
+    without waiting. While the data is unchanged, the job already running or
+    finished for it is returned instead of starting another.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported report format '{fmt}' (use {', '.join(FORMATS)})")
+    workspace = workspace or db.current_workspace()
+    key = (db.workspace_file(workspace), db.data_generation(workspace=workspace), fmt)
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.error is None:
+            _jobs.move_to_end(key)
+            return job
+        job = _jobs[key] = ReportJob(fmt, workspace, key)
+        while len(_jobs) > REPORT_CACHE_SIZE:
+            _jobs.popitem(last=False)
+    threading.Thread(target=_build, args=(job,), name="report-builder", daemon=True).start()
+    return job
+
+def _read(job):
+    """(sprint_frame, [(sprint row dict, tasks DataFrame), ...]) through the cached database reads."""
+    sprints = sprint_frame(db.sprint_summary(workspace=job.workspace))
+    tables = []
+    for sprint in sprints.iloc[::-1].to_dict("records"):
+        tasks = db.get_sprint_tasks(sprint["End Date"], workspace=job.workspace)
+        tables.append((sprint, tasks.rename(columns=lambda c: c.replace("_", " ").title())))
+    return sprints, tables
+
+def _build(job):
+    try:
+        job.stage = "Reading sprints"
+        sprints, tables = _read(job)
+        if sprints.empty:
+            raise ValueError("No sprints to report on yet")
+        chunks = [tables[i:i + SPRINTS_PER_SECTION] for i in range(0, len(tables), SPRINTS_PER_SECTION)]
+        if job.fmt == "pdf":
+            sections = [(render_charts_pdf, sprints)] + [(render_sprint_tables_pdf, chunk) for chunk in chunks]
+        else:
+            sections = [(render_efficiency, sprints), (render_status, sprints)] + [
+                (render_sprint_tables, chunk) for chunk in chunks
+            ]
+        job.total = len(sections) + 1     # + assembling the page
+        pool = _get_pool()
+        futures = {pool.submit(fn, *args): i for i, (fn, *args) in enumerate(sections)}
+        parts = [None] * len(sections)
+        for future in as_completed(futures):
+            parts[futures[future]] = future.result()
+            job.done += 1
+            job.stage = f"Rendered {job.done} of {len(sections)} sections"
+        job.stage = "Assembling"
+        if job.fmt == "pdf":
+            job.data = _merge_pdf(page for pages in parts for page in pages)
+        else:
+            job.data = _PAGE.format(
+                title=html.escape(f"Task Master Pro · {job.workspace}"),
+                generated=datetime.now().strftime("%b %d, %Y %H:%M"),
+                total=int(sprints['Tasks'].sum()), completed=int(sprints['Completed'].sum()),
+                efficiency=int(sprints['Efficiency'].mean()),
+                chart=parts[0], pie=parts[1], tables="".join(parts[2:]),
+            ).encode("utf-8")
+        job.done = job.total
+        job.stage = "Done"
+    except Exception as exc:
+        if isinstance(exc, BrokenProcessPool):
+            shutdown()
+        job.error = f"{type(exc).__name__}: {exc}"
+        job.stage = "Failed"
+    finally:
+        job.elapsed = time.perf_counter() - job.started
+        job.finished.set()
+    # Written to while it was being read: serve it to this export, but don't keep it
+    db_file, generation, _ = job.key
+    if db.read_cache.generation_of(db_file) != generation:
+        with _lock:
+            if _jobs.get(job.key) is job:
+                del _jobs[job.key]
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# The app modules live flat in the project directory, next to tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database as db
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """A fresh, migrated default workspace in tmp_path; writers and pools are closed afterwards."""
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "tasks.db"))
+    monkeypatch.setattr(db, "WORKSPACE_DIR", str(tmp_path / "workspaces"))
+    db.use_workspace(None)
+    db.use_session(None)
+    db.init_db()
+    yield db.DB_FILE
+    db.flush_writes()
+    with db._pool_lock:
+        while db._pools:
+            db._pools.popitem()[1].close()
+    db.read_cache.invalidate()
@@ -0,0 +1,108 @@
+"""
+daily_stats and task_streaks are kept up to date by every write (adding,
+ticking, unticking and deleting daily tasks). After random sequences of
+those writes both tables must equal a rebuild from the completion bitmaps,
+and daily_stats must equal a brute-force count over the status maps.
+"""
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+import database as db
+
+MONDAY = date(2026, 3, 2)
+RULES = (None, "daily", "weekdays", "weekly", "every:2", "every:3")
+
+def tables(conn):
+    return (sorted(conn.execute("SELECT log_date, completed, total FROM daily_stats WHERE total > 0").fetchall()),
+            sorted(conn.execute("SELECT * FROM task_streaks").fetchall()),
+            sorted(conn.execute("SELECT id, completed_days, progress FROM tasks").fetchall()))
+
+def assert_matches_rebuild():
+    with db._connect() as conn:
+        stored = tables(conn)
+        conn.execute("BEGIN")
+        assert db._repair_counters(conn) == 0
+        assert tables(conn) == stored
+        conn.rollback()
+        daily = conn.execute("SELECT id FROM tasks WHERE is_daily = 1").fetchall()
+    completed, total = Counter(), Counter()
+    for (task_id,) in daily:
+        for day, done in db.get_daily_status_map(task_id).items():
+            total[day] += 1
+            completed[day] += done
+    assert stored[0] == sorted((day, completed[day], n) for day, n in total.items())
+
+def add_habit(rng, rule):
+    start = MONDAY + timedelta(days=rng.randrange(-10, 10))
+    end = start + timedelta(days=rng.randrange(0, 40))
+    return db.add_task_to_db(f"Habit {rule}", "", "Low", start, end, "regular", True, rule).result()
+
+def tick_randomly(rng, task_id, n=15):
+    statuses = {MONDAY + timedelta(days=rng.randrange(-15, 50)): rng.random() < 0.7 for _ in range(n)}
+    return db.set_daily_statuses(task_id, statuses)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_writes_match_a_rebuild(workspace, seed):
+    rng = random.Random(seed)
+    habits = [add_habit(rng, rng.choice(RULES)) for _ in range(8)]
+    db.add_task_to_db("Not a habit", "", "High", MONDAY, MONDAY + timedelta(days=6), "regular", False)
+    for step in range(6):
+        for task_id in rng.sample(habits, 4):
+            tick_randomly(rng, task_id)
+        if step % 2:
+            db.delete_task(habits.pop(rng.randrange(len(habits))))
+            habits.append(add_habit(rng, rng.choice(RULES)))
+        assert_matches_rebuild()
+
+def test_overlapping_habits_share_days(workspace):
+    daily = db.add_task_to_db("Stretch", "", "Low", MONDAY, MONDAY + timedelta(days=6), "regular", True).result()
+    weekly = db.add_task_to_db("Review", "", "Low", MONDAY, MONDAY + timedelta(days=13), "regular", True,
+                               "weekly").result()
+    db.set_daily_statuses(daily, {MONDAY: True, MONDAY + timedelta(days=1): True})
+    db.toggle_daily_status(weekly, MONDAY, True)
+    assert db.get_daily_stats(MONDAY, MONDAY + timedelta(days=7)) == {
+        **{str(MONDAY + timedelta(days=d)): (0, 1) for d in range(7)},
+        str(MONDAY): (2, 2), str(MONDAY + timedelta(days=1)): (1, 1), str(MONDAY + timedelta(days=7)): (0, 1)}
+    db.delete_task(daily)
+    assert db.get_daily_stats(MONDAY, MONDAY + timedelta(days=13)) == {
+        str(MONDAY): (1, 1), str(MONDAY + timedelta(days=7)): (0, 1)}
+    assert_matches_rebuild()
+
+def test_streaks_stay_current_until_an_occurrence_is_missed(workspace):
+    daily = db.add_task_to_db("Stretch", "", "Low", MONDAY, MONDAY + timedelta(days=27), "regular", True).result()
+    weekly = db.add_task_to_db("Review", "", "Low", MONDAY, MONDAY + timedelta(days=27), "regular", True,
+                               "weekly").result()
+    db.set_daily_statuses(daily, {MONDAY + timedelta(days=d): d != 2 for d in range(6)})
+    db.set_daily_statuses(weekly, {MONDAY: True, MONDAY + timedelta(days=7): True})
+
+    def current(today):
+        return {r.task_id: (r.current, r.longest) for r in db.get_streaks(today)}
+
+    assert current(MONDAY + timedelta(days=6)) == {daily: (3, 3), weekly: (2, 2)}
+    assert current(MONDAY + timedelta(days=7)) == {daily: (0, 3), weekly: (2, 2)}
+    assert current(MONDAY + timedelta(days=14)) == {daily: (0, 3), weekly: (2, 2)}
+    assert current(MONDAY + timedelta(days=15)) == {daily: (0, 3), weekly: (0, 2)}
+    # Unticking the last day shortens the run; a task with nothing ticked has no streak
+    db.toggle_daily_status(daily, MONDAY + timedelta(days=5), False)
+    db.set_daily_statuses(weekly, {MONDAY: False, MONDAY + timedelta(days=7): False})
+    assert current(MONDAY + timedelta(days=5)) == {daily: (2, 2)}
+    assert_matches_rebuild()
+
+def test_streaks_rank_by_days_covered(workspace):
+    start = MONDAY - timedelta(weeks=9)      # MONDAY is an occurrence of every rule below
+    tasks = {rule: db.add_task_to_db(f"Habit {rule}", "", "Low", start, MONDAY + timedelta(days=6), "regular", True,
+                                     rule).result()
+             for rule in ("daily", "weekly", "every:3")}
+    # 10 days, 3 weeks and 5 three-day steps, all ending on MONDAY; the daily one also ran 12 days earlier
+    db.set_daily_statuses(tasks["daily"], {MONDAY - timedelta(days=d): True for d in [*range(10), *range(20, 32)]})
+    db.set_daily_statuses(tasks["weekly"], {MONDAY - timedelta(weeks=w): True for w in range(3)})
+    db.set_daily_statuses(tasks["every:3"], {MONDAY - timedelta(days=3 * k): True for k in range(5)})
+    ranked = db.get_streaks(MONDAY)
+    assert [(r.recurrence, r.current, r.longest) for r in ranked] == [
+        ("weekly", 3, 3), ("every:3", 5, 5), ("daily", 10, 12)]
+    # Nothing current any more: ranked by the longest run, in days
+    ranked = db.get_streaks(MONDAY + timedelta(days=30))
+    assert [(r.recurrence, r.current) for r in ranked] == [("weekly", 0), ("every:3", 0), ("daily", 0)]
@@ -0,0 +1,101 @@
+"""
+export_tasks()/import_tasks(): an export restores into an empty workspace
+as-is in every format, and an import into a workspace that already has
+tasks leaves the maintained tables (counters, daily_stats, task_streaks)
+the same as rebuilding them from the completion bitmaps.
+"""
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+import database as db
+
+MONDAY = date(2026, 3, 2)
+
+def snapshot(conn):
+    return {name: sorted(conn.execute(sql).fetchall()) for name, sql in (
+        ("tasks", "SELECT id, name, description, priority, start_date, end_date, progress, task_type, "
+                  "is_daily, recurrence, created_at, completed_days FROM tasks"),
+        ("bitmaps", "SELECT task_id, bits FROM task_completions"),
+        ("daily_stats", "SELECT log_date, completed, total FROM daily_stats WHERE total > 0"),
+        ("streaks", "SELECT * FROM task_streaks"),
+        ("sprints", "SELECT start_date, end_date, efficiency, tasks, completed FROM sprints"),
+    )}
+
+def stored_and_rebuilt():
+    """snapshot() as stored, and again after recomputing everything from the bitmaps (rolled back)."""
+    with db._connect() as conn:
+        stored = snapshot(conn)
+        conn.execute("BEGIN")
+        db._repair_counters(conn)
+        rebuilt = snapshot(conn)
+        conn.rollback()
+    return stored, rebuilt
+
+@pytest.fixture
+def history(workspace):
+    """Two weekly sprints, a resolution and daily tasks on every kind of rule, some days ticked."""
+    for week in range(2):
+        start = MONDAY + timedelta(weeks=week)
+        for i, priority in enumerate(("High", "Medium", "Low")):
+            task_id = db.add_task_to_db(f"Sprint {week} task {i}", "csv, \"quotes\"\nand newlines", priority,
+                                        start, start + timedelta(days=6), "regular", False).result()
+            db.update_task_progress(task_id, 100 if i == 0 else 40 * i)
+    db.add_task_to_db("Read 12 books", None, "High", date(2026, 1, 1), date(2026, 12, 31), "resolution", False)
+    for rule in ("daily", "weekdays", "weekly", "every:3"):
+        task_id = db.add_task_to_db(f"Habit {rule}", None, "Low", MONDAY, MONDAY + timedelta(days=27),
+                                    "regular", True, rule).result()
+        db.set_daily_statuses(task_id, {MONDAY + timedelta(days=d): d % 5 != 4 for d in range(20)})
+    db.flush_writes()
+
+@pytest.mark.parametrize("ext", [".csv", ".jsonl", ".parquet"])
+def test_export_restores_as_is(history, tmp_path, ext):
+    if ext == ".parquet":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"backup{ext}")
+    with db._connect() as conn:
+        original = snapshot(conn)
+    n_tasks, n_logs = db.export_tasks(path)
+    assert n_tasks == len(original["tasks"])
+    assert n_logs == sum(done for _, done, _ in original["daily_stats"])
+
+    db.use_workspace("restore")
+    db.init_db()
+    assert db.import_tasks(path).result() == (n_tasks, n_logs)
+    with db._connect() as conn:
+        assert snapshot(conn) == original
+
+def test_import_into_a_busy_workspace_matches_a_rebuild(history):
+    with db._connect() as conn:
+        existing = [task_id for (task_id,) in conn.execute("SELECT id FROM tasks WHERE is_daily = 1")]
+    new_tasks = [
+        {"name": "Imported daily", "start_date": "2026-03-05", "end_date": "2026-03-25", "is_daily": "1"},
+        {"name": "Imported weekly", "start_date": "2026-03-02", "end_date": "2026-04-30", "recurrence": "weekly"},
+        {"id": 500, "name": "Imported with id", "start_date": "2026-03-09", "end_date": "2026-03-15",
+         "recurrence": "every:2"},
+        {"name": "Imported sprint task", "start_date": "2026-03-16", "end_date": "2026-03-22", "progress": "70"},
+    ]
+    # Logs tick and untick the existing habits, tick the new ones (by id 500), and name unknown tasks
+    logs = [{"task_id": task_id, "log_date": str(MONDAY + timedelta(days=d)), "is_complete": (d + task_id) % 2}
+            for task_id in existing for d in range(0, 28, 3)]
+    logs += [{"task_id": 500, "log_date": day, "is_complete": 1} for day in ("2026-03-09", "2026-03-11", "2026-03-12")]
+    logs += [{"task_id": 9999, "log_date": "2026-03-09", "is_complete": 1}]
+    assert db.import_tasks(new_tasks, logs).result() == (len(new_tasks), len(logs))
+
+    stored, rebuilt = stored_and_rebuilt()
+    assert stored == rebuilt
+    assert (500, 2, 2) in [(task_id, run, longest) for task_id, _, run, longest, _ in stored["streaks"]]
+
+def test_failed_import_leaves_the_workspace_alone(history):
+    with db._connect() as conn:
+        before = snapshot(conn)
+    duplicate = [{"name": "New", "start_date": "2026-03-02", "end_date": "2026-03-08"}, {"id": 1, "name": "Clash"}]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.import_tasks(duplicate).result()
+    with db._connect() as conn:
+        assert snapshot(conn) == before
+
+def test_unknown_format(workspace, tmp_path):
+    with pytest.raises(ValueError, match="Unsupported format"):
+        db.export_tasks(str(tmp_path / "backup.xlsx"))
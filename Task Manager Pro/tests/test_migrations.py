@@ -0,0 +1,99 @@
+"""
+Schema migrations on a database that starts at version 0, with the kinds of
+daily_logs rows older databases hold: duplicate days (the last one written
+wins), ticks outside the task's span, and logs on a non-daily task.
+"""
+import sqlite3
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+import database as db
+import recurrence
+
+LOGS_SCHEMA = 6     # last schema version with a daily_logs table
+
+TASKS = [
+    # id, name, start, end, is_daily
+    (1, "Stretch", "2026-03-02", "2026-03-15", 1),
+    (2, "Read", "2026-03-10", "2026-03-12", 1),
+    (3, "Report", "2026-03-02", "2026-03-06", 0),
+    (4, "Journal", "2026-03-02", "2026-03-08", 1),
+]
+LOGS = [
+    # task_id, log_date, is_complete, in insert order
+    (1, "2026-03-02", 1),
+    (1, "2026-03-03", 1), (1, "2026-03-03", 0),    # unticked later: not done
+    (1, "2026-03-04", 0), (1, "2026-03-04", 1),    # ticked later: done
+    (1, "2026-03-05", 1), (1, "2026-03-05", 1),
+    (1, "2026-03-01", 1), (1, "2026-03-20", 1),    # outside the span: dropped
+    (2, "2026-03-10", 1), (2, "2026-03-11", 1), (2, "2026-03-12", 1),
+    (3, "2026-03-03", 1),                          # not a daily task: dropped
+]
+DONE = {
+    1: [date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 5)],
+    2: [date(2026, 3, 10), date(2026, 3, 11), date(2026, 3, 12)],
+}
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "old.db")
+    db.create_base_schema(conn)
+    conn.executemany(
+        "INSERT INTO tasks (id, name, priority, start_date, end_date, task_type, is_daily, created_at) "
+        "VALUES (?, ?, 'Low', ?, ?, 'regular', ?, ?)",
+        [(i, name, start, end, daily, start) for i, name, start, end, daily in TASKS])
+    conn.executemany("INSERT INTO daily_logs (task_id, log_date, is_complete) VALUES (?, ?, ?)", LOGS)
+    conn.commit()
+    yield conn
+    conn.close()
+
+def table(conn, sql):
+    return sorted(conn.execute(sql).fetchall())
+
+def test_migrate_stops_at_target(conn):
+    assert db.migrate(conn, target=LOGS_SCHEMA)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == LOGS_SCHEMA
+    assert not db.migrate(conn, target=LOGS_SCHEMA)
+    # Migration 1 keeps the last row written for each (task, day)
+    assert conn.execute("SELECT is_complete FROM daily_logs WHERE task_id = 1 AND log_date = '2026-03-03'").fetchall() == [(0,)]
+
+def test_logs_fold_into_bitmaps(conn):
+    db.migrate(conn, target=LOGS_SCHEMA)
+    v6_progress = table(conn, "SELECT id, completed_days, progress FROM tasks WHERE is_daily = 1")
+    assert db.migrate(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'daily_logs'").fetchall()
+
+    bitmaps = {task_id: recurrence.unpack(bits) for task_id, bits in conn.execute("SELECT task_id, bits FROM task_completions")}
+    assert set(bitmaps) == set(DONE)
+    for task_id, start, end in conn.execute("SELECT id, start_date, end_date FROM tasks WHERE id IN (1, 2)"):
+        start, end = date.fromisoformat(start), date.fromisoformat(end)
+        assert list(recurrence.done_days(start, end, bitmaps[task_id])) == DONE[task_id]
+
+    # Every v6 daily task was an every-day task, so counters and progress carry over unchanged
+    assert table(conn, "SELECT id, completed_days, progress FROM tasks WHERE is_daily = 1") == v6_progress
+    assert table(conn, "SELECT id, recurrence FROM tasks") == [(1, "daily"), (2, "daily"), (3, None), (4, "daily")]
+    assert db._recompute_recurring(conn.cursor(), verify_only=True) == 0
+
+def test_stats_and_streaks_after_migration(conn):
+    db.migrate(conn)
+    total, completed = Counter(), Counter()
+    for task_id, _, start, end, daily in TASKS:
+        if daily:
+            start, end = date.fromisoformat(start), date.fromisoformat(end)
+            total.update(start + timedelta(days=i) for i in range((end - start).days + 1))
+            completed.update(DONE.get(task_id, []))
+    assert table(conn, "SELECT log_date, completed, total FROM daily_stats") == sorted(
+        (str(day), completed[day], n) for day, n in total.items())
+    assert table(conn, "SELECT task_id, run_end, run_length, longest, next_due FROM task_streaks") == [
+        (1, "2026-03-05", 2, 2, "2026-03-06"),
+        (2, "2026-03-12", 3, 3, "2026-03-13"),
+    ]
+
+    # The same as rebuilding both tables from the bitmaps again
+    before = (table(conn, "SELECT * FROM daily_stats"), table(conn, "SELECT * FROM task_streaks"))
+    db._rebuild_daily_stats(conn.cursor())
+    db._refresh_streaks(conn.cursor())
+    assert (table(conn, "SELECT * FROM daily_stats"), table(conn, "SELECT * FROM task_streaks")) == before
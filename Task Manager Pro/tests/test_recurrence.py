@@ -0,0 +1,186 @@
+"""
+recurrence.py against brute-force day-by-day answers: every rule, spans that
+start on a weekend, and windows clipped on either side.
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import recurrence
+
+RULES = ("daily", "weekdays", "weekly", "every:2", "every:3")
+SATURDAY = date(2026, 10, 17)
+MONDAY = date(2026, 10, 19)
+
+def days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+def brute_occurrences(rule, start, end):
+    step, weekdays = recurrence.parse_rule(rule)
+    if weekdays:
+        return [d for d in days(start, end) if d.weekday() < 5]
+    return [d for d in days(start, end) if (d - start).days % step == 0]
+
+def bits_for(start, done):
+    bits = 0
+    for day in done:
+        bits |= 1 << (day - start).days
+    return bits
+
+def spans(seed=0, n=60):
+    """Random (start, end, lo, hi) spans, some starting on a weekend."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        start = SATURDAY + timedelta(days=rng.randrange(-10, 10))
+        end = start + timedelta(days=rng.randrange(0, 60))
+        lo = start + timedelta(days=rng.randrange(-5, 40))
+        hi = lo + timedelta(days=rng.randrange(-3, 30))
+        out.append((start, end, lo, hi))
+    return out
+
+# ==========================================
+# RULES
+# ==========================================
+
+def test_parse_and_normalize():
+    assert recurrence.parse_rule(None) == recurrence.parse_rule("") == (1, False)
+    assert recurrence.parse_rule(" Weekdays ") == (1, True)
+    assert recurrence.parse_rule("every:5") == (5, False)
+    assert recurrence.normalize_rule("every:1") == "daily"
+    assert recurrence.normalize_rule("every:7") == "weekly"
+    assert recurrence.normalize_rule("EVERY:3") == "every:3"
+
+@pytest.mark.parametrize("rule", ["hourly", "every:0", "every:x", "every:-2"])
+def test_parse_rejects_unknown_rules(rule):
+    with pytest.raises(ValueError):
+        recurrence.parse_rule(rule)
+
+def test_run_label():
+    assert recurrence.run_label("daily", 1) == "1 day"
+    assert recurrence.run_label("daily", 4) == "4 days"
+    assert recurrence.run_label("weekly", 5) == "5 weeks"
+    assert recurrence.run_label("weekdays", 2) == "2 weekdays"
+    assert recurrence.run_label("every:3", 4) == "4 × every 3 days"
+
+def test_run_days():
+    assert recurrence.run_days("daily", 10) == 10
+    assert recurrence.run_days("weekly", 3) == 21
+    assert recurrence.run_days("every:3", 4) == 12
+    assert recurrence.run_days("weekdays", 4) == 4
+    assert recurrence.run_days("weekdays", 5) == 7
+    assert recurrence.run_days("weekdays", 12) == 16
+    assert recurrence.run_days(None, 0) == 0
+
+# ==========================================
+# OCCURRENCES
+# ==========================================
+
+def test_weekdays_starting_on_a_weekend():
+    assert recurrence.nth("weekdays", SATURDAY, 0) == MONDAY
+    assert recurrence.nth("weekdays", SATURDAY, 4) == MONDAY + timedelta(days=4)
+    assert recurrence.nth("weekdays", SATURDAY, 5) == MONDAY + timedelta(days=7)
+    assert list(recurrence.occurrences("weekdays", SATURDAY, SATURDAY + timedelta(days=1))) == []
+    assert recurrence.count("weekdays", SATURDAY, SATURDAY + timedelta(days=1)) == 0
+    assert recurrence.next_after("weekdays", SATURDAY, SATURDAY) == MONDAY
+    assert not recurrence.is_occurrence("weekdays", SATURDAY, MONDAY, SATURDAY)
+
+def test_every_n_steps_from_the_start_date():
+    start = date(2026, 1, 30)
+    assert list(recurrence.occurrences("every:3", start, date(2026, 2, 8))) == [
+        date(2026, 1, 30), date(2026, 2, 2), date(2026, 2, 5), date(2026, 2, 8)]
+    # A window that starts between occurrences begins at the next one
+    assert next(recurrence.occurrences("every:3", start, date(2026, 3, 1), lo=date(2026, 2, 3))) == date(2026, 2, 5)
+    assert recurrence.next_after("every:3", start, date(2026, 2, 2)) == date(2026, 2, 5)
+
+@pytest.mark.parametrize("rule", RULES)
+def test_nth_matches_brute_force(rule):
+    for start in days(SATURDAY, SATURDAY + timedelta(days=6)):
+        expected = brute_occurrences(rule, start, start + timedelta(days=120))
+        assert [recurrence.nth(rule, start, n) for n in range(len(expected))] == expected
+
+@pytest.mark.parametrize("rule", RULES)
+def test_occurrences_and_count_match_brute_force(rule):
+    for start, end, lo, hi in spans():
+        all_days = brute_occurrences(rule, start, end)
+        window = [d for d in all_days if lo <= d <= hi]
+        assert list(recurrence.occurrences(rule, start, end)) == all_days
+        assert list(recurrence.occurrences(rule, start, end, lo, hi)) == window
+        assert recurrence.count(rule, start, end) == len(all_days)
+        assert recurrence.count(rule, start, end, lo, hi) == len(window)
+        assert [d for d in days(start, end) if recurrence.is_occurrence(rule, start, end, d)] == all_days
+
+# ==========================================
+# COMPLETION BITMAPS
+# ==========================================
+
+def test_pack_round_trip():
+    for bits in (0, 1, 0b1011, 1 << 364, (1 << 365) - 1):
+        assert recurrence.unpack(recurrence.pack(bits)) == bits
+    assert recurrence.unpack(None) == 0
+
+@pytest.mark.parametrize("rule", RULES)
+def test_tick_skips_non_occurrences_and_reports_flips(rule):
+    start, end = SATURDAY, SATURDAY + timedelta(days=20)
+    due = brute_occurrences(rule, start, end)
+    outside = [start - timedelta(days=1), end + timedelta(days=1)]
+    not_due = [d for d in days(start, end) if d not in due]
+    bits, changes = recurrence.tick(rule, start, end, 0, [(d, True) for d in due + not_due + outside])
+    assert changes == [(1, d) for d in due]
+    assert list(recurrence.done_days(start, end, bits)) == due
+    # Ticking again changes nothing; unticking one day flips just that day
+    assert recurrence.tick(rule, start, end, bits, [(due[0], True)]) == (bits, [])
+    bits, changes = recurrence.tick(rule, start, end, bits, [(due[0], False)])
+    assert changes == [(-1, due[0])]
+    assert recurrence.count_done(start, end, bits) == len(due) - 1
+    assert recurrence.progress(rule, start, end, bits) == (len(due) - 1) * 100 // len(due)
+
+def test_status_map_and_windowed_counts():
+    start, end = SATURDAY, SATURDAY + timedelta(days=13)
+    done = [MONDAY, MONDAY + timedelta(days=2), MONDAY + timedelta(days=7)]
+    bits = bits_for(start, done)
+    status = recurrence.status_map("weekdays", start, end, bits, MONDAY, MONDAY + timedelta(days=2))
+    assert status == {str(MONDAY): True, str(MONDAY + timedelta(days=1)): False, str(MONDAY + timedelta(days=2)): True}
+    assert recurrence.count_done(start, end, bits, lo=MONDAY + timedelta(days=1)) == 2
+    assert recurrence.count_done(start, end, bits, hi=MONDAY) == 1
+    assert recurrence.progress("daily", start, start - timedelta(days=1), 0) is None
+
+# ==========================================
+# STREAKS
+# ==========================================
+
+def brute_latest_run(rule, start, end, done):
+    dues = brute_occurrences(rule, start, end)
+    flags = [d in done for d in dues]
+    if not any(flags):
+        return None
+    last = max(i for i, f in enumerate(flags) if f)
+    length = 0
+    while last - length >= 0 and flags[last - length]:
+        length += 1
+    longest = run = 0
+    for f in flags:
+        run = run + 1 if f else 0
+        longest = max(longest, run)
+    return dues[last], length, longest
+
+def test_latest_run_counts_occurrences_not_days():
+    # Weekly habit ticked five weeks running: a run of 5
+    done = [SATURDAY + timedelta(weeks=w) for w in range(5)]
+    assert recurrence.latest_run("weekly", SATURDAY, SATURDAY + timedelta(weeks=10), bits_for(SATURDAY, done)) == (
+        done[-1], 5, 5)
+    # Weekdays: Friday then Monday is unbroken; the weekend isn't due
+    friday = MONDAY + timedelta(days=4)
+    done = [friday - timedelta(days=1), friday, friday + timedelta(days=3)]
+    assert recurrence.latest_run("weekdays", SATURDAY, SATURDAY + timedelta(days=20), bits_for(SATURDAY, done)) == (
+        friday + timedelta(days=3), 3, 3)
+    assert recurrence.latest_run("daily", SATURDAY, MONDAY, 0) is None
+
+@pytest.mark.parametrize("rule", RULES)
+def test_latest_run_matches_brute_force(rule):
+    rng = random.Random(rule)
+    for start, end, _, _ in spans(seed=1):
+        due = brute_occurrences(rule, start, end)
+        done = {d for d in due if rng.random() < 0.7}
+        assert recurrence.latest_run(rule, start, end, bits_for(start, done)) == brute_latest_run(rule, start, end, done)
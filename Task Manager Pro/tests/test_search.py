@@ -0,0 +1,72 @@
+"""
+The tasks_fts index after inserts, bulk imports, renames and deletes: it
+matches what a full rebuild from the tasks table would hold, and
+search_tasks() finds exactly the tasks whose words start with the query.
+"""
+import re
+from datetime import date
+
+import pytest
+
+import database as db
+
+WORDS = ("gym", "groceries", "report", "résumé", "review", "standup", "taxes", "team")
+
+def add(name, desc, priority="Medium"):
+    return db.add_task_to_db(name, desc, priority, date(2026, 3, 2), date(2026, 3, 8), "regular", False)
+
+def rename(task_id, name, desc):
+    return db._submit(db._execute, "UPDATE tasks SET name = ?, description = ? WHERE id = ?", (name, desc, task_id))
+
+def fold(text):
+    return (text or "").lower().replace("é", "e")
+
+def brute_search(query):
+    """Ids of tasks where every query word prefixes some word of the name or description."""
+    words = fold(query).split()
+    with db._connect() as conn:
+        rows = conn.execute("SELECT id, name, description FROM tasks").fetchall()
+    return sorted(task_id for task_id, name, desc in rows
+                  if all(any(w.startswith(q) for w in re.findall(r"\w+", fold(f"{name} {desc}"))) for q in words))
+
+def index_snapshot(conn):
+    """Every (term, rowid) the index holds, via an fts5vocab view."""
+    conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts_terms USING fts5vocab(main, tasks_fts, instance)")
+    return sorted(conn.execute("SELECT term, doc, col, offset FROM temp.fts_terms").fetchall())
+
+@pytest.fixture
+def tasks(workspace):
+    ids = [add(f"{a} {b}", f"{b} notes", priority) for a, b, priority in (
+        ("Gym", "review", "High"), ("Groceries", "team", "Low"), ("Report", "taxes", "Medium"),
+        ("Standup", "résumé", "High"), ("Team", "gym", "Low"))]
+    ids = [f.result() for f in ids]
+    db.import_tasks([{"name": "Imported taxes report", "description": "standup", "priority": "Low",
+                      "start_date": "2026-03-09", "end_date": "2026-03-15"}]).result()
+    rename(ids[1], "Weekly review", "résumé and taxes").result()
+    db.delete_task(ids[2]).result()
+    return ids
+
+def test_index_matches_a_rebuild(tasks):
+    with db._connect() as conn:
+        conn.execute("INSERT INTO tasks_fts(tasks_fts, rank) VALUES ('integrity-check', 1)")
+        synced = index_snapshot(conn)
+        conn.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+        assert index_snapshot(conn) == synced
+        conn.rollback()
+
+@pytest.mark.parametrize("query", WORDS + ("re", "t", "gym review", "resume", "TAX", '"taxes'))
+def test_search_matches_brute_force(tasks, query):
+    assert sorted(r.id for r in db.search_tasks(query, limit=100)) == brute_search(query.replace('"', " "))
+
+def test_renamed_and_deleted_tasks(tasks):
+    assert [r.name for r in db.search_tasks("weekly")] == ["Weekly review"]
+    assert not db.search_tasks("groceries")
+    assert [r.name for r in db.search_tasks("report")] == ["Imported taxes report"]
+
+def test_name_hits_rank_first_and_filters(tasks):
+    # "taxes" is in the imported task's name and the renamed task's description
+    assert [r.name for r in db.search_tasks("taxes")] == ["Imported taxes report", "Weekly review"]
+    assert [r.id for r in db.search_tasks("gym", priority="Low")] == [tasks[4]]
+    assert [r.name for r in db.search_tasks("taxes", date_range=(date(2026, 3, 10), date(2026, 3, 10)))] == [
+        "Imported taxes report"]
+    assert db.search_tasks("   ") == []
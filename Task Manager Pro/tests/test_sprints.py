@@ -0,0 +1,102 @@
+"""
+The trigger-maintained sprints table against a GROUP BY over tasks, after
+random mixes of inserts, deletes, imports and UPDATEs that set columns to
+new or to unchanged values (UPDATE OF triggers fire either way).
+"""
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+import database as db
+
+MONDAY = date(2026, 3, 2)
+TYPES = ("regular", "regular", "daily", "resolution")
+
+GROUPED_SQL = '''
+    SELECT end_date, MIN(start_date), COUNT(*), SUM(COALESCE(progress, 0)), SUM(COALESCE(progress, 0) = 100)
+    FROM tasks WHERE task_type != 'resolution' AND end_date IS NOT NULL
+    GROUP BY end_date
+'''
+
+def sprints_and_grouped():
+    with db._connect() as conn:
+        stored = conn.execute("SELECT end_date, start_date, tasks, progress_sum, completed FROM sprints").fetchall()
+        return sorted(stored), sorted(conn.execute(GROUPED_SQL).fetchall())
+
+def update(sql, *params):
+    return db._submit(db._execute, f"UPDATE tasks SET {sql} WHERE id = ?", params)
+
+def random_end(rng):
+    return str(MONDAY + timedelta(weeks=rng.randrange(6), days=6))
+
+def random_update(rng, task_id):
+    end = random_end(rng)
+    start = str(date.fromisoformat(end) - timedelta(days=rng.randrange(10)))
+    progress = rng.choice((0, 30, 60, 100, None))
+    same = "end_date = end_date, task_type = task_type, start_date = start_date"
+    return rng.choice((
+        lambda: update("progress = ?", progress, task_id),
+        lambda: update(f"progress = ?, {same}", progress, task_id),      # the double-count case
+        lambda: update("start_date = ?", start, task_id),
+        lambda: update("start_date = ?, end_date = end_date", start, task_id),
+        lambda: update("start_date = NULL", task_id),
+        lambda: update("end_date = ?", end, task_id),
+        lambda: update("end_date = ?, progress = ?", end, progress, task_id),
+        lambda: update("end_date = ?, start_date = ?", end, start, task_id),
+        lambda: update("task_type = ?", rng.choice(TYPES), task_id),
+        lambda: update("task_type = task_type, progress = ?", progress, task_id),
+        lambda: db.delete_task(task_id),
+    ))()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_updates_match_a_group_by(workspace, seed):
+    rng = random.Random(seed)
+    for i in range(30):
+        end = date.fromisoformat(random_end(rng))
+        db.add_task_to_db(f"Task {i}", "", "Low", end - timedelta(days=rng.randrange(7)), end, rng.choice(TYPES), False)
+    db.import_tasks([{"name": f"Imported {i}", "start_date": "" if i % 4 == 0 else "2026-03-03",
+                      "end_date": random_end(rng), "progress": rng.choice(("0", "100", "55"))} for i in range(10)])
+    for _ in range(8):
+        with db._connect() as conn:
+            ids = [task_id for (task_id,) in conn.execute("SELECT id FROM tasks")]
+        for task_id in rng.sample(ids, min(10, len(ids))):
+            random_update(rng, task_id)
+        stored, grouped = sprints_and_grouped()
+        assert stored == grouped
+
+def test_unchanged_end_date_does_not_double_count(workspace):
+    task_id = db.add_task_to_db("Task", "", "Low", MONDAY, MONDAY + timedelta(days=6), "regular", False).result()
+    update("progress = 100, end_date = end_date, task_type = task_type", task_id).result()
+    update("start_date = ?", str(MONDAY + timedelta(days=2)), task_id).result()
+    assert sprints_and_grouped()[0] == [(str(MONDAY + timedelta(days=6)), str(MONDAY + timedelta(days=2)), 1, 100, 1)]
+
+def test_sprints_are_numbered_by_end_date(workspace):
+    def numbers():
+        return db.sprint_summary()[["sprint", "end_date"]].values.tolist()
+
+    weeks = [MONDAY + timedelta(weeks=w) for w in range(3)]
+    ids = [db.add_task_to_db(f"Week {w}", "", "Low", s, s + timedelta(days=6), "regular", False).result()
+           for w, s in enumerate(weeks)]
+    assert numbers() == [[1, "2026-03-08"], [2, "2026-03-15"], [3, "2026-03-22"]]
+    # An older sprint created later, and a sprint emptied and refilled, still number by end_date
+    db.add_task_to_db("Earlier", "", "Low", MONDAY - timedelta(weeks=1), MONDAY - timedelta(days=1), "regular", False)
+    db.delete_task(ids[1])
+    db.add_task_to_db("Refill", "", "Low", weeks[1], weeks[1] + timedelta(days=6), "regular", False)
+    assert numbers() == [[1, "2026-03-01"], [2, "2026-03-08"], [3, "2026-03-15"], [4, "2026-03-22"]]
+
+def test_migration_8_repairs_drift(tmp_path):
+    conn = sqlite3.connect(tmp_path / "v7.db")
+    db.migrate(conn, target=7)
+    conn.execute("INSERT INTO tasks (name, priority, start_date, end_date, progress, task_type, is_daily, created_at) "
+                 "VALUES ('Task', 'Low', '2026-03-02', '2026-03-08', 40, 'regular', 0, '2026-03-02')")
+    # What version 7's triggers left after "SET progress = 60, end_date = end_date": 40 out, 60 in, +20 again
+    conn.execute("UPDATE tasks SET progress = 60")
+    conn.execute("UPDATE sprints SET progress_sum = 80, start_date = NULL")
+    conn.commit()
+    assert db.migrate(conn)
+    assert conn.execute("SELECT start_date, tasks, progress_sum FROM sprints").fetchall() == [("2026-03-02", 1, 60)]
+    conn.execute("UPDATE tasks SET progress = 70, end_date = end_date")
+    assert conn.execute("SELECT progress_sum FROM sprints").fetchall() == [(70,)]
+    conn.close()
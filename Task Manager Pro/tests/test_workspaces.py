@@ -0,0 +1,91 @@
+"""
+Workspaces: each is its own file, pool and writer; only MAX_OPEN_WORKSPACES
+pools and writers stay open, least recently used closed first, without
+losing queued writes or breaking connections still borrowed.
+"""
+import sqlite3
+from datetime import date
+
+import pytest
+
+import database as db
+
+def create(*workspaces):
+    for workspace in workspaces:
+        db.use_workspace(workspace)
+        db.init_db()
+    db.use_workspace(None)
+
+def add(name, workspace):
+    return db.add_task_to_db(name, "", "Low", date(2026, 3, 2), date(2026, 3, 8), "regular", False, workspace=workspace)
+
+def names(workspace):
+    return db.get_tasks_df(workspace=workspace)["name"].tolist()
+
+@pytest.fixture
+def three(workspace, monkeypatch):
+    """Three workspaces with room for only two open pools/writers."""
+    monkeypatch.setattr(db, "MAX_OPEN_WORKSPACES", 2)
+    create("alpha", "beta", "gamma")
+    return [db.workspace_file(w) for w in ("alpha", "beta", "gamma")]
+
+def test_slugs_and_listing(workspace):
+    assert db.workspace_slug("  Team Alpha! ") == "team-alpha"
+    assert db.workspace_slug("!!!") == db.DEFAULT_WORKSPACE
+    with pytest.raises(ValueError):
+        db.workspace_file("../escape")
+    create("beta", "alpha")
+    assert db.list_workspaces() == [db.DEFAULT_WORKSPACE, "alpha", "beta"]
+
+def test_writes_stay_in_their_workspace(workspace):
+    create("alpha", "beta")
+    add("in alpha", "alpha").result()
+    assert names("alpha") == ["in alpha"]
+    assert names("beta") == [] and names(db.DEFAULT_WORKSPACE) == []
+
+def test_least_recently_used_pool_is_closed(three):
+    alpha, beta, gamma = three
+    pools = [db.get_pool(f) for f in three]
+    assert list(db._pools) == [beta, gamma]
+    assert pools[0]._closed and not pools[1]._closed
+    # Using beta again makes gamma the next to go
+    db.get_pool(beta)
+    db.get_pool(alpha)
+    assert list(db._pools) == [beta, alpha]
+    assert pools[2]._closed and db.get_pool(alpha) is not pools[0]
+
+def test_borrowed_connection_outlives_eviction(three):
+    alpha, beta, gamma = three
+    pool = db.get_pool(alpha)
+    conn = pool.acquire()
+    db.get_pool(beta)
+    db.get_pool(gamma)
+    assert pool._closed
+    assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone() == (0,)
+    pool.release(conn)
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    # Borrowing from the closed pool hands out a throwaway connection
+    conn = pool.acquire()
+    pool.release(conn)
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+def test_evicted_writer_commits_its_queue(three):
+    futures = [add(f"task {i}", w) for i in range(20) for w in ("alpha", "beta", "gamma")]
+    assert len(db._writers) == 2
+    # Round-robin over three workspaces evicts a writer on every submit, flushing its queue first
+    assert all(f.done() for f in futures[:-2])
+    for f in futures:
+        f.result()
+    assert names("alpha") == [f"task {i}" for i in range(20)]
+    assert names("gamma") == [f"task {i}" for i in range(20)]
+
+def test_cache_entries_survive_writes_elsewhere(workspace):
+    create("alpha", "beta")
+    names("alpha")
+    names("beta")
+    hits = db.cache_stats()["hits"]
+    add("in beta", "beta").result()
+    assert names("alpha") == [] and db.cache_stats()["hits"] == hits + 1
+    assert names("beta") == ["in beta"] and db.cache_stats()["hits"] == hits + 1
@@ -0,0 +1,90 @@
+"""
+WriteQueue: ops queued behind a busy writer commit together, a failing op
+only fails its own future, and a session's reads wait for its own writes
+but not for anyone else's.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import database as db
+
+def hold(conn, started, gate):
+    """An op that keeps the writer busy until gate is set."""
+    started.set()
+    gate.wait(5)
+
+def held(submit):
+    """Queues hold() and returns its gate once the writer is inside it: later ops queue up behind it."""
+    gate, started = threading.Event(), threading.Event()
+    submit(hold, started, gate)
+    started.wait(5)
+    return gate
+
+def insert(conn, name):
+    return conn.execute(
+        "INSERT INTO tasks (name, priority, start_date, end_date, task_type, is_daily, created_at) "
+        "VALUES (?, 'Low', '2026-03-02', '2026-03-08', 'regular', 0, '2026-03-02')", (name,)).lastrowid
+
+def fail(conn, name):
+    insert(conn, name)
+    raise RuntimeError("boom")
+
+def names(db_file):
+    with db._connect(db_file) as conn:
+        return sorted(name for (name,) in conn.execute("SELECT name FROM tasks"))
+
+@pytest.fixture
+def writer(workspace):
+    writer = db.WriteQueue(workspace)
+    yield writer
+    writer.close()
+
+def test_queued_ops_share_one_commit(writer, workspace):
+    gate = held(writer.submit)
+    futures = [writer.submit(insert, f"Task {i}") for i in range(10)]
+    gate.set()
+    assert [f.result(5) for f in futures] == list(range(1, 11))
+    assert writer.stats()["batches"] == 2     # the held op, then the ten that queued behind it
+    assert writer.stats()["ops"] == 11
+    assert names(workspace) == sorted(f"Task {i}" for i in range(10))
+
+def test_batches_stop_at_batch_size(workspace):
+    writer = db.WriteQueue(workspace, batch_size=4)
+    gate = held(writer.submit)
+    futures = [writer.submit(insert, f"Task {i}") for i in range(10)]
+    gate.set()
+    for f in futures:
+        f.result(5)
+    writer.close()
+    assert writer.batches == 1 + 3      # 4 + 4 + 2
+
+def test_failing_op_rolls_back_alone(writer, workspace):
+    gate = held(writer.submit)
+    before = writer.submit(insert, "before")
+    failing = writer.submit(fail, "half-written")
+    after = writer.submit(insert, "after")
+    gate.set()
+    with pytest.raises(RuntimeError, match="boom"):
+        failing.result(5)
+    assert before.result(5) and after.result(5)
+    assert writer.stats()["batches"] == 2
+    assert names(workspace) == ["after", "before"]
+
+def test_reads_wait_for_own_session_only(workspace):
+    db.use_session("alice")
+    gate = held(db._submit)
+    db._submit(insert, "queued by alice")
+
+    # Another session reads the committed state straight away, past alice's queued writes
+    def bob_reads():
+        db.use_session("bob")
+        return names(workspace)
+    with ThreadPoolExecutor(1) as pool:
+        assert pool.submit(bob_reads).result(5) == []
+
+    # Alice's own read waits until her writes commit
+    threading.Timer(0.2, gate.set).start()
+    assert db.get_tasks_df()["name"].tolist() == ["queued by alice"]
+    assert gate.is_set()